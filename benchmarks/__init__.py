@@ -0,0 +1,37 @@
+"""
+Performance benchmarks for the service.
+
+Benchmarks are run as modules from the project root, for example:
+
+    python -m benchmarks.activation
+"""
+import os
+
+from contextlib import contextmanager
+
+
+def setup():
+    """
+    Configure Django for a benchmark script.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """
+    Run the block against a test database created (and destroyed) like
+    `./manage.py test` does, so that benchmarks never write to the configured
+    database. With `keepdb` the test database is kept between runs.
+    """
+    from django.test.runner import DiscoverRunner
+
+    runner = DiscoverRunner(verbosity=0, interactive=False, keepdb=keepdb)
+    old_config = runner.setup_databases()
+    try:
+        yield
+    finally:
+        runner.teardown_databases(old_config)
@@ -0,0 +1,114 @@
+"""
+Benchmark company activation time against the number of currencies.
+
+Rehive is replaced with an in-process stand-in that sleeps for `--latency`
+seconds per call. Every activation runs in a transaction that is rolled
+back, so the database is left untouched.
+
+    python -m benchmarks.activation --counts 1 10 100 1000 --latency 0.05
+"""
+import argparse
+import copy
+import json
+import time
+import uuid
+
+from benchmarks import setup
+
+
+class FakeResource(object):
+
+    def __init__(self, data, latency):
+        self.data = data
+        self.latency = latency
+
+    def get(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return copy.deepcopy(self.data)
+
+
+class Namespace(object):
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class FakeRehive(object):
+    """
+    Answers the calls made by `ActivateSerializer`.
+    """
+
+    def __init__(self, currencies, latency):
+        company = 'benchmark-{}'.format(uuid.uuid4().hex)
+        self.user = FakeResource({
+            'identifier': str(uuid.uuid4()),
+            'groups': [{'name': 'admin'}],
+            'company': company,
+        }, latency)
+        self.admin = Namespace(company=FakeResource({
+            'identifier': company,
+            'name': 'Benchmark',
+        }, latency))
+        self.company = Namespace(currencies=FakeResource([
+            {
+                'code': 'C{}'.format(i),
+                'description': 'Currency {}'.format(i),
+                'symbol': '$',
+                'unit': 'unit',
+                'divisibility': 2,
+                'enabled': True,
+            } for i in range(currencies)
+        ], latency))
+
+
+def activate(currencies, latency):
+    from django.db import transaction
+    from gitos import serializers
+
+    rehive = FakeRehive(currencies, latency)
+    serializers.get_rehive = lambda *args, **kwargs: rehive
+
+    start = time.perf_counter()
+    with transaction.atomic():
+        serializer = serializers.ActivateSerializer(data={'token': 'bench'})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        duration = time.perf_counter() - start
+        transaction.set_rollback(True)
+
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--counts', type=int, nargs='+',
+        default=[1, 10, 100, 1000])
+    parser.add_argument('--latency', type=float, default=0.05,
+        help='Seconds added to every Rehive call.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', default=False,
+        help='Print machine-readable results.')
+    args = parser.parse_args()
+
+    setup()
+    from benchmarks.utils import summarize
+
+    results = []
+    for count in args.counts:
+        durations = [activate(count, args.latency)
+                     for i in range(args.repeat)]
+        results.append(dict(currencies=count, **summarize(durations)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print('{:>10} {:>10} {:>10} {:>10}'.format(
+        'currencies', 'mean ms', 'min ms', 'max ms'))
+    for result in results:
+        print('{currencies:>10} {mean_ms:>10.1f} {min_ms:>10.1f} '
+              '{max_ms:>10.1f}'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
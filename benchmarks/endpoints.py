@@ -0,0 +1,267 @@
+"""
+Measure the throughput and latency of every API route.
+
+The application from `config/wsgi.py` is served in-process with a threaded
+WSGI server, against a local fake Rehive server (see
+`benchmarks.fake_rehive`). Each route is driven with `--requests` requests
+at a fixed `--concurrency`. The application uses a test database, created
+for the run and destroyed afterwards (kept with `--keepdb`), never the
+configured one.
+
+Client, server and fake Rehive share one process, so compare results
+between commits rather than reading them as absolute capacity.
+
+    python -m benchmarks.endpoints --concurrency 8 --requests 400 --json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import threading
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import requests
+
+from benchmarks import setup, test_database
+from benchmarks.fake_rehive import start_server as start_rehive
+
+
+ADMIN_TOKEN = 'admin'
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_app(host='127.0.0.1', port=0):
+    """
+    Serve `config.wsgi.application` in a background thread.
+    """
+    from config.wsgi import application
+
+    server = make_server(host, port, application,
+        server_class=ThreadingWSGIServer,
+        handler_class=QuietWSGIRequestHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, 'http://{}:{}'.format(host, server.server_port)
+
+
+def get_routes(run, bounty_id):
+    """
+    Return (name, method, path, get_body, token) for every route. `get_body`
+    receives the request number, so that requests creating rows never
+    collide.
+    """
+    def pull_request(i):
+        return {
+            'action': 'opened',
+            'pull_request': {
+                'id': run['pr_base'] + i,
+                'user': {'login': 'bench-{}'.format(i % 50)},
+                'body': 'Fixes #{}'.format(i % 100),
+                'issue_url': '{}{}'.format(run['url_prefix'], i),
+                'merged': False,
+            },
+        }
+
+    def bounty(i):
+        return {
+            'issue_nr': 100000 + i,
+            'url': '{}new/{}'.format(run['url_prefix'], i),
+            'amount': 1,
+            'status': 'open',
+        }
+
+    def company_token(i):
+        return {'token': 'company-{}'.format(i)}
+
+    return (
+        ('root', 'GET', '/api/', None, None),
+        ('verify', 'GET', '/api/verify/', None, ADMIN_TOKEN),
+        ('github', 'POST', '/api/github/', pull_request, None),
+        ('bounties', 'GET', '/api/github/bounties/', None, None),
+        ('bounties-create', 'POST', '/api/github/bounties/', bounty, None),
+        ('bounties-export', 'GET', '/api/github/bounties/export/', None, None),
+        ('bounty', 'GET', '/api/github/bounties/{}/'.format(bounty_id), None,
+         None),
+        ('admin-company', 'GET', '/api/admin/company/', None, ADMIN_TOKEN),
+        ('admin-currencies', 'GET', '/api/admin/currencies/', None,
+         ADMIN_TOKEN),
+        ('admin-currencies-export', 'GET', '/api/admin/currencies/export/',
+         None, ADMIN_TOKEN),
+        ('admin-currency', 'GET', '/api/admin/currencies/C0/', None,
+         ADMIN_TOKEN),
+        ('activate', 'POST', '/api/activate/', company_token, None),
+        ('deactivate', 'POST', '/api/deactivate/', company_token, None),
+    )
+
+
+def drive(base_url, route, requests_, concurrency):
+    """
+    Make `requests_` requests to a route from `concurrency` threads. Returns
+    the wall time, per request durations and status codes.
+    """
+    name, method, path, get_body, token = route
+    local = threading.local()
+    headers = {'Accept': 'application/json'}
+    if token:
+        headers['Authorization'] = 'Token {}'.format(token)
+
+    def call(i):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+
+        start = time.perf_counter()
+        try:
+            response = local.session.request(method, base_url + path,
+                json=get_body(i) if get_body else None, headers=headers)
+            response.content
+            status = response.status_code
+        except requests.RequestException:
+            status = None
+        return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(requests_)))
+    wall = time.perf_counter() - start
+
+    return wall, [d for d, s in results], [s for d, s in results]
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def seed(run, bounties):
+    from gitos.enums import GithubIssueBountyStatus
+    from gitos.models import GithubIssueBounty
+
+    GithubIssueBounty.objects.bulk_create([
+        GithubIssueBounty(issue_nr=i, url='{}{}'.format(run['url_prefix'], i),
+            amount=i, status=GithubIssueBountyStatus.OPEN)
+        for i in range(bounties)
+    ])
+    return GithubIssueBounty.objects.filter(
+        url__startswith=run['url_prefix']).values_list('id', flat=True).first()
+
+
+def cleanup(run):
+    from gitos.models import (
+        Company, GithubDelivery, GithubIssueBounty, GithubWebhookJob
+    )
+
+    deliveries = GithubDelivery.objects.filter(pr_id__gte=run['pr_base'])
+    GithubWebhookJob.objects.filter(
+        id__in=[d.result['job'] for d in deliveries if d.result]).delete()
+    deliveries.delete()
+    GithubIssueBounty.objects.filter(
+        url__startswith=run['url_prefix']).delete()
+    for company in Company.objects.filter(
+            identifier__startswith=run['company_prefix']):
+        company.admin.delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400,
+        help='Requests per route.')
+    parser.add_argument('--latency', type=float, default=0.05,
+        help='Seconds added to every Rehive call.')
+    parser.add_argument('--currencies', type=int, default=10)
+    parser.add_argument('--bounties', type=int, default=100,
+        help='Bounties created before the run.')
+    parser.add_argument('--routes', nargs='+', default=None,
+        help='Only drive these routes.')
+    parser.add_argument('--keepdb', action='store_true', default=False,
+        help='Keep the test database between runs.')
+    parser.add_argument('--json', action='store_true', default=False,
+        help='Print machine-readable results.')
+    args = parser.parse_args()
+
+    rehive = start_rehive(latency=args.latency, currencies=args.currencies)
+    os.environ['REHIVE_API_URL'] = rehive.url
+    os.environ.setdefault('REHIVE_AUTH_TOKEN', ADMIN_TOKEN)
+
+    setup()
+    from benchmarks.utils import summarize
+
+    run = {
+        'company_prefix': rehive.company_prefix,
+        'url_prefix': 'https://github.com/benchmark/{}/issues/'.format(
+            uuid.uuid4().hex[:8]),
+        'pr_base': int(time.time()) * 100000,
+    }
+
+    results = []
+    with test_database(keepdb=args.keepdb):
+        server, base_url = start_app()
+
+        # VerifyView prints the request data, keep stdout for the results.
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                response = requests.post(base_url + '/api/activate/',
+                    json={'token': ADMIN_TOKEN})
+                if response.status_code != 201:
+                    raise SystemExit('Activation failed: {} {}'.format(
+                        response.status_code, response.text))
+
+                routes = get_routes(run, seed(run, args.bounties))
+                for route in routes:
+                    if args.routes and route[0] not in args.routes:
+                        continue
+
+                    wall, durations, statuses = drive(base_url, route,
+                        args.requests, args.concurrency)
+                    results.append(dict(
+                        route=route[0],
+                        method=route[1],
+                        concurrency=args.concurrency,
+                        errors=sum(1 for s in statuses
+                            if s is None or s >= 400),
+                        rps=len(durations) / wall,
+                        **summarize(durations)
+                    ))
+            finally:
+                server.shutdown()
+                cleanup(run)
+
+    if args.json:
+        print(json.dumps({
+            'commit': get_commit(),
+            'latency': args.latency,
+            'concurrency': args.concurrency,
+            'rehive_calls': rehive.requests,
+            'results': results,
+        }, indent=2))
+        return
+
+    print('{:<24} {:>6} {:>8} {:>8} {:>8} {:>8}'.format(
+        'route', 'errors', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms'))
+    for result in results:
+        print('{route:<24} {errors:>6} {rps:>8.1f} {p50_ms:>8.1f} '
+              '{p95_ms:>8.1f} {p99_ms:>8.1f}'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
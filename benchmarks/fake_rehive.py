@@ -0,0 +1,210 @@
+"""
+Local stand-in for the Rehive API used by the benchmarks.
+
+Implements the calls made by the service: `user.get`, `admin.company.get`,
+`company.currencies.get`, `admin.users.*` and `admin.transactions.*`. Every
+response is delayed by `latency` seconds. The company of a token is derived
+from the token, so each token activates its own company.
+
+Run it on its own with:
+
+    python -m benchmarks.fake_rehive --port 8100 --latency 0.05
+
+and point the service at it with `REHIVE_API_URL=http://127.0.0.1:8100/3/`.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+
+PREFIX = '/3/'
+
+
+class FakeRehiveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    routes = (
+        ('GET', r'^user/$', 'get_user'),
+        ('GET', r'^admin/company/$', 'get_company'),
+        ('GET', r'^company/currencies/$', 'get_currencies'),
+        ('POST', r'^admin/users/$', 'create_user'),
+        ('GET', r'^admin/users/(?P<identifier>[^/]+)/$', 'get_user_by_id'),
+        ('GET', r'^admin/transactions/$', 'get_transactions'),
+        ('POST', r'^admin/transactions/(?P<tx_type>credit|debit)/$',
+         'create_transaction'),
+        ('PATCH', r'^admin/transactions/(?P<tx_id>[^/]+)/$',
+         'update_transaction'),
+    )
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_POST(self):
+        self.dispatch()
+
+    def do_PATCH(self):
+        self.dispatch()
+
+    def log_message(self, format, *args):
+        pass
+
+    def dispatch(self):
+        time.sleep(self.server.latency)
+        self.server.count_request()
+
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = json.loads(self.rfile.read(length).decode('utf-8')) \
+            if length else {}
+        self.query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        path = url.path
+        if path == PREFIX.rstrip('/') or path == PREFIX:
+            return self.respond(200, {'status': 'success', 'data': {}})
+        if not path.startswith(PREFIX):
+            return self.respond(404, {'status': 'error', 'message': 'Not found.'})
+
+        token = self.get_token()
+        if token is None or token == 'invalid':
+            return self.respond(401, {
+                'status': 'error', 'message': 'Invalid token.'})
+
+        for method, pattern, name in self.routes:
+            match = re.match(pattern, path[len(PREFIX):])
+            if method == self.command and match:
+                data = getattr(self, name)(token, **match.groupdict())
+                return self.respond(200, {'status': 'success', 'data': data})
+
+        self.respond(404, {'status': 'error', 'message': 'Not found.'})
+
+    def respond(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_token(self):
+        auth = (self.headers.get('Authorization') or '').split()
+        if len(auth) != 2 or auth[0].lower() != 'token':
+            return None
+        return auth[1]
+
+    def get_company_id(self, token):
+        return '{}-{}'.format(self.server.company_prefix, token)
+
+    def get_user(self, token):
+        return {
+            'identifier': str(uuid.uuid5(uuid.NAMESPACE_URL, token)),
+            'groups': [{'name': 'admin'}],
+            'company': self.get_company_id(token),
+        }
+
+    def get_company(self, token):
+        return {
+            'identifier': self.get_company_id(token),
+            'name': 'Benchmark {}'.format(token),
+        }
+
+    def get_currencies(self, token):
+        return {
+            'count': self.server.currencies,
+            'next': None,
+            'previous': None,
+            'results': [{
+                'code': 'C{}'.format(i),
+                'description': 'Currency {}'.format(i),
+                'symbol': '$',
+                'unit': 'unit',
+                'divisibility': 2,
+                'enabled': True,
+            } for i in range(self.server.currencies)],
+        }
+
+    def create_user(self, token):
+        return {'identifier': str(uuid.uuid4())}
+
+    def get_user_by_id(self, token, identifier):
+        return {'identifier': identifier}
+
+    def get_transactions(self, token):
+        return {
+            'count': 1,
+            'next': None,
+            'previous': None,
+            'results': [{
+                'id': str(uuid.uuid4()),
+                'reference': self.query.get('reference', ''),
+                'status': 'Pending',
+            }],
+        }
+
+    def create_transaction(self, token, tx_type):
+        return dict(self.body, id=str(uuid.uuid4()), tx_type=tx_type,
+            status=self.body.get('status', 'complete'))
+
+    def update_transaction(self, token, tx_id):
+        return dict(self.body, id=tx_id)
+
+
+class FakeRehiveServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0, currencies=10, company_prefix=None):
+        HTTPServer.__init__(self, address, FakeRehiveHandler)
+        self.latency = latency
+        self.currencies = currencies
+        self.company_prefix = company_prefix or 'bench-{}'.format(
+            uuid.uuid4().hex[:8])
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return 'http://{}:{}{}'.format(host, port, PREFIX)
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+
+def start_server(host='127.0.0.1', port=0, **kwargs):
+    """
+    Start a fake Rehive server in a background thread.
+    """
+    server = FakeRehiveServer((host, port), **kwargs)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--latency', type=float, default=0.05,
+        help='Seconds added to every call.')
+    parser.add_argument('--currencies', type=int, default=10)
+    args = parser.parse_args()
+
+    server = FakeRehiveServer((args.host, args.port), latency=args.latency,
+        currencies=args.currencies)
+    print('Fake Rehive listening on {}'.format(server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
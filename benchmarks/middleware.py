@@ -0,0 +1,117 @@
+"""
+Compare requests per second of the deployed WSGI application
+(`config.wsgi.application`, which routes the API through the lean middleware
+chain) with a stock Django `WSGIHandler` running the full chain.
+
+Requests are made in-process, so only the handler, middleware and view are
+measured.
+
+    python -m benchmarks.middleware --requests 2000 --path /api/
+"""
+import argparse
+import json
+import time
+
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks import setup
+
+
+def get_environ(path, token=None):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'REMOTE_ADDR': '10.0.0.1',
+        'HTTP_ACCEPT': 'application/json',
+    }
+    if token:
+        environ['HTTP_AUTHORIZATION'] = 'Token {}'.format(token)
+    setup_testing_defaults(environ)
+    return environ
+
+
+def call(handler, environ):
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(status)
+
+    response = handler(dict(environ), start_response)
+    try:
+        for chunk in response:
+            pass
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+
+    return statuses[0]
+
+
+def get_django_handler(application, path):
+    """
+    Return the Django handler serving `path` in a WSGI application.
+    """
+    for prefix, handler in getattr(application, 'routes', ()):
+        if path.startswith(prefix):
+            return handler
+    return getattr(application, 'default', application)
+
+
+def measure(handler, environ, requests):
+    durations = []
+    for i in range(requests):
+        start = time.perf_counter()
+        call(handler, environ)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--path', default='/api/')
+    parser.add_argument('--token', default=None,
+        help='Token sent with every request.')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--json', action='store_true', default=False,
+        help='Print machine-readable results.')
+    args = parser.parse_args()
+
+    setup()
+    from django.core.handlers.wsgi import WSGIHandler
+    from benchmarks.utils import summarize
+    from config.wsgi import application
+
+    handlers = (
+        ('stock', WSGIHandler()),
+        ('app', application),
+    )
+    environ = get_environ(args.path, args.token)
+
+    results = []
+    for name, handler in handlers:
+        # Warm up the middleware, URL resolver and caches.
+        status = call(handler, environ)
+        durations = measure(handler, environ, args.requests)
+        django_handler = get_django_handler(handler, args.path)
+        results.append(dict(
+            chain=name,
+            status=status,
+            middleware=len(django_handler._request_middleware) +
+                len(django_handler._response_middleware),
+            rps=len(durations) / sum(durations),
+            **summarize(durations)
+        ))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print('{:<6} {:<16} {:>10} {:>10} {:>10}'.format(
+        'chain', 'status', 'req/s', 'p50 ms', 'p99 ms'))
+    for result in results:
+        print('{chain:<6} {status:<16} {rps:>10.0f} {p50_ms:>10.2f} '
+              '{p99_ms:>10.2f}'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
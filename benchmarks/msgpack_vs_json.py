@@ -0,0 +1,108 @@
+"""
+Compare payload size and encode/decode time of JSON and MessagePack.
+
+Payloads are the bounty and currency list responses, built from in-memory
+rows with the serializers of the API, then rendered and parsed with the REST
+framework renderers and parsers it uses. No database is needed.
+
+    python -m benchmarks.msgpack_vs_json --rows 1000
+"""
+import argparse
+import io
+import json
+import time
+
+from collections import OrderedDict
+from decimal import Decimal
+
+from benchmarks import setup
+
+
+def get_payloads(rows):
+    from gitos.enums import GithubIssueBountyStatus
+    from gitos.models import Currency, GithubIssueBounty
+    from gitos.serializers import CurrencySerializer, GithubBountiesSerializer
+
+    bounties = [
+        GithubIssueBounty(
+            issue_nr=i,
+            url='https://api.github.com/repos/rehive/gitos/issues/{}'.format(i),
+            amount=Decimal('{}.000000000000000000'.format(i * 100)),
+            status=GithubIssueBountyStatus.OPEN
+        ) for i in range(rows)
+    ]
+    currencies = [
+        Currency(
+            code='C{}'.format(i),
+            description='Currency {}'.format(i),
+            symbol='$',
+            unit='unit',
+            divisibility=2,
+            enabled=i % 2 == 0
+        ) for i in range(rows)
+    ]
+
+    return OrderedDict([
+        ('bounties', {'status': 'success',
+            'data': GithubBountiesSerializer(bounties, many=True).data}),
+        ('currencies', {'status': 'success',
+            'data': CurrencySerializer(currencies, many=True).data}),
+    ])
+
+
+def measure(func, repeat):
+    durations = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true', default=False,
+        help='Print machine-readable results.')
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from gitos.parsers import MessagePackParser
+    from gitos.renderers import MessagePackRenderer
+
+    formats = (
+        ('json', JSONRenderer(), JSONParser()),
+        ('msgpack', MessagePackRenderer(), MessagePackParser()),
+    )
+
+    results = []
+    for name, payload in get_payloads(args.rows).items():
+        for fmt, renderer, parser_ in formats:
+            body = renderer.render(payload)
+            results.append({
+                'payload': name,
+                'format': fmt,
+                'rows': args.rows,
+                'bytes': len(body),
+                'encode_ms': measure(
+                    lambda: renderer.render(payload), args.repeat),
+                'decode_ms': measure(
+                    lambda: parser_.parse(io.BytesIO(body)), args.repeat),
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print('{:<12} {:<8} {:>10} {:>10} {:>10}'.format(
+        'payload', 'format', 'bytes', 'encode ms', 'decode ms'))
+    for result in results:
+        print('{payload:<12} {format:<8} {bytes:>10} {encode_ms:>10.2f} '
+              '{decode_ms:>10.2f}'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
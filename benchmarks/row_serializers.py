@@ -0,0 +1,113 @@
+"""
+Compare the per-row cost of the DRF list serializers with the row
+serializers used by the read-only list views.
+
+Rows are built in memory, no database is needed. The rendered output of
+both paths is compared byte for byte before timing.
+
+    python -m benchmarks.row_serializers --rows 10000
+"""
+import argparse
+import json
+import time
+
+from datetime import datetime
+from decimal import Decimal
+
+from benchmarks import setup
+
+
+def get_rows(rows):
+    from gitos.enums import GithubIssueBountyStatus
+    from gitos.models import Currency, GithubIssueBounty
+
+    now = datetime(2018, 3, 25)
+    bounties = [
+        (now, i, i, 'https://github.com/rehive/gitos/issues/{}'.format(i),
+         Decimal('{}.250000000000000000'.format(i)),
+         GithubIssueBountyStatus.OPEN)
+        for i in range(rows)
+    ]
+    currencies = [
+        (now, i, 'C{}'.format(i), 'Currency {}'.format(i), '$', None, 2,
+         i % 2 == 0)
+        for i in range(rows)
+    ]
+
+    return (
+        ('bounties', GithubIssueBounty, bounties),
+        ('currencies', Currency, currencies),
+    )
+
+
+def measure(func, repeat):
+    durations = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', default=False,
+        help='Print machine-readable results.')
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.renderers import JSONRenderer
+    from gitos.serializers import (
+        CurrencySerializer, GithubBountiesSerializer, CurrencyRowSerializer,
+        GithubBountiesRowSerializer
+    )
+
+    serializers = {
+        'bounties': (GithubBountiesSerializer, GithubBountiesRowSerializer),
+        'currencies': (CurrencySerializer, CurrencyRowSerializer),
+    }
+    renderer = JSONRenderer()
+
+    results = []
+    for name, model, rows in get_rows(args.rows):
+        serializer_class, row_serializer_class = serializers[name]
+        row_serializer = row_serializer_class()
+        instances = [
+            model(**dict(zip(('created', 'id') + row_serializer.columns, row)))
+            for row in rows
+        ]
+
+        def drf():
+            return serializer_class(instances, many=True).data
+
+        def fast():
+            return [row_serializer.to_representation(row[2:]) for row in rows]
+
+        if renderer.render(drf()) != renderer.render(fast()):
+            raise SystemExit('{}: outputs differ'.format(name))
+
+        for path, func in (('serializer', drf), ('row', fast)):
+            duration = measure(func, args.repeat)
+            results.append({
+                'payload': name,
+                'path': path,
+                'rows': args.rows,
+                'total_ms': duration * 1000,
+                'per_row_us': duration / args.rows * 1000000,
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print('{:<12} {:<12} {:>10} {:>12}'.format(
+        'payload', 'path', 'total ms', 'per row us'))
+    for result in results:
+        print('{payload:<12} {path:<12} {total_ms:>10.1f} '
+              '{per_row_us:>12.2f}'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
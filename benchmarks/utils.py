@@ -0,0 +1,32 @@
+import math
+import statistics
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    if not values:
+        return None
+
+    values = sorted(values)
+    rank = int(math.ceil(pct / 100.0 * len(values)))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+def summarize(durations):
+    """
+    Summarize a list of durations (in seconds) in milliseconds.
+    """
+    if not durations:
+        return {'count': 0}
+
+    return {
+        'count': len(durations),
+        'mean_ms': statistics.mean(durations) * 1000,
+        'min_ms': min(durations) * 1000,
+        'p50_ms': percentile(durations, 50) * 1000,
+        'p95_ms': percentile(durations, 95) * 1000,
+        'p99_ms': percentile(durations, 99) * 1000,
+        'max_ms': max(durations) * 1000,
+    }
@@ -0,0 +1,247 @@
+"""
+Replay GitHub pull request webhooks against the GitHub endpoint.
+
+A corpus of `pull_request` events is generated (or loaded with `--corpus`):
+every pull request is opened and later closed, merged or not. Bodies
+reference `#issue` numbers, and authors are a mix of returning and new users.
+Events are sent with the headers GitHub uses, at a fixed `--rate` (events
+per second, 0 for as fast as possible) from `--concurrency` threads. With a
+rate, latency is measured from the scheduled send time.
+
+Without `--url` the application is served in-process against a test
+database, created for the run and destroyed afterwards (kept with
+`--keepdb`), never the configured one. Queued jobs are not processed.
+
+    python -m benchmarks.webhook_replay --events 2000 --rate 100 --concurrency 16
+    python -m benchmarks.webhook_replay --save corpus.jsonl --events 500
+    python -m benchmarks.webhook_replay --corpus corpus.jsonl --url http://127.0.0.1:8000/api/github/
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks import setup, test_database
+
+
+def get_pull_request_event(action, pr_id, number, user, body, merged=False,
+                           repository='rehive/gitos'):
+    issue_url = 'https://api.github.com/repos/{}/issues/{}'.format(
+        repository, number)
+    return {
+        'action': action,
+        'number': number,
+        'pull_request': {
+            'id': pr_id,
+            'number': number,
+            'url': 'https://api.github.com/repos/{}/pulls/{}'.format(
+                repository, number),
+            'html_url': 'https://github.com/{}/pull/{}'.format(
+                repository, number),
+            'issue_url': issue_url,
+            'state': 'closed' if action == 'closed' else 'open',
+            'title': 'Pull request {}'.format(number),
+            'body': body,
+            'merged': merged,
+            'user': {'login': user['login'], 'id': user['id'], 'type': 'User'},
+        },
+        'repository': {'full_name': repository},
+        'sender': {'login': user['login'], 'id': user['id']},
+    }
+
+
+def generate_corpus(events, new_users=0.3, merged=0.7, references=0.8,
+                    issues=200, returning_users=50, seed=None):
+    """
+    Return a list of events: every pull request is opened, and closed some
+    events later. Pull requests reference an issue in their body with
+    probability `references` and are merged with probability `merged`.
+    """
+    rng = random.Random(seed)
+    pr_base = int(time.time()) * 100000
+    users = [{'login': 'contributor-{}'.format(i), 'id': i}
+             for i in range(returning_users)]
+
+    corpus = []
+    open_prs = []
+    number = 0
+
+    while len(corpus) < events:
+        # Close a pull request about as often as one is opened.
+        if open_prs and (rng.random() < 0.5 or
+                         len(corpus) + len(open_prs) >= events):
+            pr = open_prs.pop(rng.randrange(len(open_prs)))
+            corpus.append(get_pull_request_event('closed', pr['id'],
+                pr['number'], pr['user'], pr['body'],
+                merged=rng.random() < merged))
+            continue
+
+        number += 1
+        if rng.random() < new_users:
+            user = {'login': 'new-{}'.format(uuid.uuid4().hex[:12]),
+                    'id': 1000000 + number}
+        else:
+            user = rng.choice(users)
+
+        if rng.random() < references:
+            body = 'Fixes #{}\n\nDescription of the change.'.format(
+                rng.randint(1, issues))
+        else:
+            body = 'Description of the change.'
+
+        pr = {'id': pr_base + number, 'number': number, 'user': user,
+              'body': body}
+        open_prs.append(pr)
+        corpus.append(get_pull_request_event('opened', pr['id'], number,
+            user, body))
+
+    return corpus
+
+
+def load_corpus(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_corpus(corpus, path):
+    with open(path, 'w') as f:
+        for event in corpus:
+            f.write(json.dumps(event) + '\n')
+
+
+def replay(url, corpus, rate, concurrency, timeout):
+    """
+    Send every event of the corpus. Returns the wall time and a
+    (latency, status) tuple per event, status is None for failed requests.
+    """
+    local = threading.local()
+    start = time.perf_counter()
+
+    def send(i):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+
+        scheduled = start + i / rate if rate else time.perf_counter()
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        try:
+            response = local.session.post(url, json=corpus[i], timeout=timeout,
+                headers={
+                    'X-GitHub-Event': 'pull_request',
+                    'X-GitHub-Delivery': str(uuid.uuid4()),
+                    'User-Agent': 'GitHub-Hookshot/benchmark',
+                })
+            response.content
+            status = response.status_code
+        except requests.RequestException:
+            status = None
+
+        return time.perf_counter() - scheduled, status
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, range(len(corpus))))
+
+    return time.perf_counter() - start, results
+
+
+def cleanup(corpus):
+    from gitos.models import GithubDelivery, GithubWebhookJob
+
+    deliveries = GithubDelivery.objects.filter(
+        pr_id__in={e['pull_request']['id'] for e in corpus})
+    GithubWebhookJob.objects.filter(
+        id__in=[d.result['job'] for d in deliveries if d.result]).delete()
+    deliveries.delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--url', default=None,
+        help='GitHub endpoint of a running service.')
+    parser.add_argument('--corpus', default=None,
+        help='Replay events from a JSON lines file.')
+    parser.add_argument('--save', default=None,
+        help='Save the generated corpus to a JSON lines file and exit.')
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--new-users', type=float, default=0.3,
+        help='Fraction of pull requests opened by new users.')
+    parser.add_argument('--merged', type=float, default=0.7,
+        help='Fraction of closed pull requests that are merged.')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--rate', type=float, default=0,
+        help='Events per second, 0 to send as fast as possible.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=10,
+        help='Seconds before a request counts as timed out, GitHub waits 10.')
+    parser.add_argument('--keepdb', action='store_true', default=False,
+        help='Keep the test database between runs.')
+    parser.add_argument('--json', action='store_true', default=False,
+        help='Print machine-readable results.')
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = generate_corpus(args.events, new_users=args.new_users,
+            merged=args.merged, seed=args.seed)
+
+    if args.save:
+        save_corpus(corpus, args.save)
+        return
+
+    from benchmarks.utils import summarize
+
+    if args.url is None:
+        setup()
+        from benchmarks.endpoints import start_app
+
+        with test_database(keepdb=args.keepdb):
+            server, base_url = start_app()
+            try:
+                wall, results = replay(base_url + '/api/github/', corpus,
+                    args.rate, args.concurrency, args.timeout)
+            finally:
+                server.shutdown()
+                cleanup(corpus)
+    else:
+        wall, results = replay(args.url, corpus, args.rate, args.concurrency,
+            args.timeout)
+
+    statuses = Counter(str(s) if s else 'error' for l, s in results)
+    errors = sum(1 for l, s in results if s is None or s >= 400)
+    result = dict(
+        events=len(corpus),
+        actions=dict(Counter(
+            'merged' if e['pull_request']['merged'] else e['action']
+            for e in corpus)),
+        rate=args.rate,
+        concurrency=args.concurrency,
+        throughput=len(results) / wall,
+        errors=errors,
+        error_rate=float(errors) / len(results) if results else 0,
+        statuses=dict(statuses),
+        **summarize([l for l, s in results])
+    )
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print('events:     {events} {actions}'.format(**result))
+    print('throughput: {throughput:.1f} events/s'.format(**result))
+    print('errors:     {errors} ({error_rate:.2%}) {statuses}'.format(**result))
+    print('latency:    p50 {p50_ms:.1f}ms p95 {p95_ms:.1f}ms '
+          'p99 {p99_ms:.1f}ms max {max_ms:.1f}ms'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Compare the concurrent request capacity and memory of the sync and gthread
+gunicorn worker modes.
+
+Gunicorn is started with `config/gunicorn.py` in each mode, against a local
+fake Rehive server (see `benchmarks.fake_rehive`). The token cache is
+disabled so that every request waits on Rehive, like the first request of a
+token does. Each mode is driven at increasing concurrency, and the resident
+memory of the master and its workers is read from /proc.
+
+    python -m benchmarks.worker_modes --latency 0.1 --concurrency 1 8 32 64
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from benchmarks import setup
+from benchmarks.endpoints import ADMIN_TOKEN, drive
+from benchmarks.fake_rehive import start_server as start_rehive
+
+
+def get_free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def get_children(pid):
+    children = []
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open('/proc/{}/stat'.format(name)) as f:
+                # The process name may contain spaces, the ppid follows it.
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (IOError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            children.append(int(name))
+    return children
+
+
+def get_rss(pid):
+    """
+    Resident memory in bytes of a process and its children.
+    """
+    total = 0
+    for p in [pid] + get_children(pid):
+        try:
+            with open('/proc/{}/status'.format(p)) as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+        except IOError:
+            continue
+    return total
+
+
+def start_gunicorn(mode, workers, threads, env):
+    port = get_free_port()
+    # Configured through the environment, like in production.
+    env = dict(env,
+        GUNICORN_WORKER_CLASS=mode,
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_THREADS=str(threads))
+    process = subprocess.Popen([
+        sys.executable, '-m', 'gunicorn.app.wsgiapp',
+        '-c', 'config/gunicorn.py',
+        '--bind', '127.0.0.1:{}'.format(port),
+        'config.wsgi:application',
+    ], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = 'http://127.0.0.1:{}'.format(port)
+    for i in range(100):
+        try:
+            requests.get(base_url + '/healthz', timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+
+    process.kill()
+    raise SystemExit('gunicorn ({}) did not start'.format(mode))
+
+
+def main():
+    cpus = multiprocessing.cpu_count()
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--concurrency', type=int, nargs='+',
+        default=[1, 8, 32, 64])
+    parser.add_argument('--requests', type=int, default=500,
+        help='Requests per concurrency level.')
+    parser.add_argument('--latency', type=float, default=0.1,
+        help='Seconds added to every Rehive call.')
+    parser.add_argument('--sync-workers', type=int, default=cpus * 2 + 1)
+    parser.add_argument('--gthread-workers', type=int, default=cpus + 1)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--json', action='store_true', default=False,
+        help='Print machine-readable results.')
+    args = parser.parse_args()
+
+    rehive = start_rehive(latency=args.latency)
+    os.environ['REHIVE_API_URL'] = rehive.url
+
+    setup()
+    from benchmarks.utils import summarize
+    from gitos.models import Company
+
+    env = dict(os.environ,
+        REHIVE_TOKEN_CACHE_SIZE='0',
+        REHIVE_AUTH_TOKEN=ADMIN_TOKEN,
+        QUERY_PROFILER_SAMPLE_RATE='0',
+        prometheus_multiproc_dir=tempfile.mkdtemp(prefix='gitos-metrics-'))
+    route = ('admin-company', 'GET', '/api/admin/company/', None, ADMIN_TOKEN)
+
+    modes = (
+        ('sync', args.sync_workers, 1),
+        ('gthread', args.gthread_workers, args.threads),
+    )
+
+    results = []
+    try:
+        for mode, workers, threads in modes:
+            process, base_url = start_gunicorn(mode, workers, threads, env)
+            try:
+                if not Company.objects.filter(
+                        identifier__startswith=rehive.company_prefix).exists():
+                    requests.post(base_url + '/api/activate/',
+                        json={'token': ADMIN_TOKEN}).raise_for_status()
+
+                idle_rss = get_rss(process.pid)
+                for concurrency in args.concurrency:
+                    wall, durations, statuses = drive(base_url, route,
+                        args.requests, concurrency)
+                    results.append(dict(
+                        mode=mode,
+                        workers=workers,
+                        threads=threads,
+                        concurrency=concurrency,
+                        errors=sum(1 for s in statuses
+                                   if s is None or s >= 400),
+                        rps=len(durations) / wall,
+                        idle_rss_mb=idle_rss / 1024.0 ** 2,
+                        rss_mb=get_rss(process.pid) / 1024.0 ** 2,
+                        **summarize(durations)
+                    ))
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        for company in Company.objects.filter(
+                identifier__startswith=rehive.company_prefix):
+            company.admin.delete()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print('{:<8} {:>8} {:>8} {:>12} {:>6} {:>8} {:>8} {:>8}'.format(
+        'mode', 'workers', 'threads', 'concurrency', 'errors', 'req/s',
+        'p99 ms', 'rss MB'))
+    for result in results:
+        print('{mode:<8} {workers:>8} {threads:>8} {concurrency:>12} '
+              '{errors:>6} {rps:>8.1f} {p99_ms:>8.1f} '
+              '{rss_mb:>8.1f}'.format(**result))
+
+
+if __name__ == '__main__':
+    main()
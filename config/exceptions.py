@@ -28,6 +28,27 @@ class APIError(Exception):
     def __str__(self):
         return self.detail
 
+class NotModified(exceptions.APIException):
+    """
+    Raised when a conditional request matches the current representation.
+    """
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = _('Not modified.')
+
+
+class ServiceUnavailable(exceptions.APIException):
+    """
+    Raised when a service we depend on is unavailable. `wait` is sent as the
+    Retry-After header.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Service temporarily unavailable, try again later.')
+
+    def __init__(self, detail=None, wait=None):
+        super(ServiceUnavailable, self).__init__(detail)
+        self.wait = wait
+
+
 def custom_exception_handler(exc, context):
     """
         Returns the response that should be used for any given exception.
@@ -38,7 +59,11 @@ def custom_exception_handler(exc, context):
         Any unhandled exceptions may return `None`, which will cause a 500 error
         to be raised.
     """
-    if isinstance(exc, exceptions.APIException):
+    if isinstance(exc, NotModified):
+        # 304 responses must not include a body.
+        return Response(status=exc.status_code)
+
+    elif isinstance(exc, exceptions.APIException):
         headers = {}
         if getattr(exc, 'auth_header', None):
             headers['WWW-Authenticate'] = exc.auth_header
@@ -1,11 +1,47 @@
-import multiprocessing
 import os
+import shutil
+import tempfile
 
 bind = '0.0.0.0:8000'
 # bind = "127.0.0.1:8000"
-workers = multiprocessing.cpu_count() * 2 + 1
 name = os.environ.get('PROJECT_NAME')
 log_level = 'info'
 log_file = '-'
 pythonpath = '/app/'
 forwarded_allow_ips = '*'
+
+# Requests mostly wait on Rehive. `gthread` workers serve `threads` requests
+# each while they wait, for a fraction of the memory of one sync worker per
+# concurrent request. See "Worker modes" in the README for sizing.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+
+if worker_class == 'gthread':
+    threads = int(os.environ.get('GUNICORN_THREADS', 8))
+else:
+    threads = 1
+
+# A single worker, like gunicorn without a config, unless set explicitly
+# (Heroku sets `WEB_CONCURRENCY` from the dyno size).
+workers = int(os.environ.get('GUNICORN_WORKERS',
+    os.environ.get('WEB_CONCURRENCY', 1)))
+
+# Read by the settings to size the Rehive connection pool per process.
+os.environ['GUNICORN_THREADS'] = str(threads)
+
+# Workers write their metrics to this directory so that /metrics can
+# aggregate them. Must be set before the application is imported.
+os.environ.setdefault('prometheus_multiproc_dir',
+    os.path.join(tempfile.gettempdir(), 'gitos-metrics'))
+
+
+def on_starting(server):
+    # Drop the metrics of a previous run.
+    path = os.environ['prometheus_multiproc_dir']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    # Stop counting the live gauges of dead workers.
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
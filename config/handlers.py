@@ -0,0 +1,100 @@
+"""
+WSGI handlers running different URL prefixes through different middleware
+chains.
+
+The token authenticated API is stateless and does not need sessions,
+messages, CSRF, locale or the debug toolbar, so requests below
+`API_MIDDLEWARE_PREFIXES` only run the middleware in
+`API_MIDDLEWARE_CLASSES`. Everything else, like the admin dashboard, uses
+the full `MIDDLEWARE_CLASSES` chain.
+"""
+import logging
+
+import django
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.wsgi import WSGIHandler
+from django.utils import six
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('django.request')
+
+
+class ProfileWSGIHandler(WSGIHandler):
+    """
+    WSGI handler that loads `middleware_classes` instead of
+    `settings.MIDDLEWARE_CLASSES`.
+    """
+
+    def __init__(self, middleware_classes, *args, **kwargs):
+        self.middleware_classes = middleware_classes
+        super(ProfileWSGIHandler, self).__init__(*args, **kwargs)
+
+    def load_middleware(self):
+        # Mirrors BaseHandler.load_middleware for a custom middleware list.
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._response_middleware = []
+        self._exception_middleware = []
+
+        request_middleware = []
+        for middleware_path in self.middleware_classes:
+            mw_class = import_string(middleware_path)
+            try:
+                mw_instance = mw_class()
+            except MiddlewareNotUsed as exc:
+                if settings.DEBUG:
+                    if six.text_type(exc):
+                        logger.debug('MiddlewareNotUsed(%r): %s', middleware_path, exc)
+                    else:
+                        logger.debug('MiddlewareNotUsed: %r', middleware_path)
+                continue
+
+            if hasattr(mw_instance, 'process_request'):
+                request_middleware.append(mw_instance.process_request)
+            if hasattr(mw_instance, 'process_view'):
+                self._view_middleware.append(mw_instance.process_view)
+            if hasattr(mw_instance, 'process_template_response'):
+                self._template_response_middleware.insert(0, mw_instance.process_template_response)
+            if hasattr(mw_instance, 'process_response'):
+                self._response_middleware.insert(0, mw_instance.process_response)
+            if hasattr(mw_instance, 'process_exception'):
+                self._exception_middleware.insert(0, mw_instance.process_exception)
+
+        # We only assign to this when initialization is complete as it is used
+        # as a flag for initialization being complete.
+        self._request_middleware = request_middleware
+
+
+class RoutingWSGIHandler(object):
+    """
+    Dispatch requests to the handler of the first matching path prefix, or to
+    the default handler.
+    """
+
+    def __init__(self, default, routes):
+        self.default = default
+        self.routes = routes
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        for prefix, handler in self.routes:
+            if path.startswith(prefix):
+                return handler(environ, start_response)
+        return self.default(environ, start_response)
+
+
+def get_wsgi_application():
+    """
+    Like `django.core.wsgi.get_wsgi_application`, with a lean middleware
+    chain for the API routes.
+    """
+    django.setup()
+
+    default = WSGIHandler()
+    if settings.API_MIDDLEWARE_CLASSES is None:
+        return default
+
+    api = ProfileWSGIHandler(settings.API_MIDDLEWARE_CLASSES)
+    return RoutingWSGIHandler(default,
+        [(prefix, api) for prefix in settings.API_MIDDLEWARE_PREFIXES])
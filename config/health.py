@@ -0,0 +1,217 @@
+"""
+Background readiness checks.
+
+Each process runs its checks in a daemon thread on an interval and keeps the
+last result, so readiness probes never touch the database or Rehive
+themselves.
+"""
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from logging import getLogger
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = getLogger('django')
+
+
+def check_databases():
+    """
+    Run a query that does not depend on any tables on every database. The
+    monitor thread keeps its own connections open between runs.
+    """
+    for name in connections:
+        connection = connections[name]
+        connection.close_if_unusable_or_obsolete()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+                if cursor.fetchone() is None:
+                    raise Exception('{}: invalid response'.format(name))
+        except Exception:
+            # Reconnect on the next run.
+            connection.close()
+            raise
+
+    return {'databases': list(connections)}
+
+
+def check_rehive():
+    """
+    Check that the Rehive API answers through the shared connection pool.
+    """
+    from gitos.clients import get_session
+
+    response = get_session().get(settings.REHIVE_API_URL,
+        timeout=settings.HEALTH_CHECK_TIMEOUT)
+    if response.status_code >= 500:
+        raise Exception('rehive: status {}'.format(response.status_code))
+
+    return {'status_code': response.status_code}
+
+
+def get_pool_usage():
+    """
+    Return the number of Rehive connections in use and the pool size.
+    """
+    from gitos.clients import get_session
+
+    adapter = get_session().get_adapter(settings.REHIVE_API_URL)
+    pools = adapter.poolmanager.pools
+
+    in_use = 0
+    size = 0
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is None or pool.pool is None:
+            continue
+        # Idle connections and free slots are kept in the queue.
+        size += settings.REHIVE_POOL_SIZE
+        in_use += settings.REHIVE_POOL_SIZE - pool.pool.qsize()
+
+    return in_use, max(size, settings.REHIVE_POOL_SIZE)
+
+
+def check_rehive_pool():
+    """
+    Fail when the Rehive connection pool is saturated.
+    """
+    in_use, size = get_pool_usage()
+    saturation = float(in_use) / size
+    detail = {'in_use': in_use, 'size': size, 'saturation': saturation}
+
+    if saturation >= settings.HEALTH_POOL_SATURATION:
+        raise Exception('rehive pool: {} of {} connections in use'.format(
+            in_use, size))
+
+    return detail
+
+
+def check_rehive_breaker():
+    """
+    Report the state of the Rehive circuit breaker, failing while it is open.
+    """
+    from gitos.clients import breaker
+
+    status = breaker.get_status()
+    if status['state'] == breaker.OPEN:
+        raise Exception('rehive breaker: open, retry in {}s'.format(
+            breaker.retry_after()))
+
+    return status
+
+
+# (name, check, critical). Only failing critical checks make the process
+# unready, Rehive being down must not take down routes that do not use it.
+CHECKS = (
+    ('database', check_databases, True),
+    ('rehive', check_rehive, False),
+    ('rehive_pool', check_rehive_pool, False),
+    ('rehive_breaker', check_rehive_breaker, False),
+)
+
+
+def run_checks(checks=CHECKS):
+    """
+    Run every check and return a result per check with its latency.
+    """
+    results = OrderedDict()
+    for name, check, critical in checks:
+        start = time.perf_counter()
+        try:
+            detail = check()
+            ok = True
+        except Exception as exc:
+            detail = str(exc)
+            ok = False
+        results[name] = OrderedDict([
+            ('ok', ok),
+            ('critical', critical),
+            ('latency_ms', round((time.perf_counter() - start) * 1000, 3)),
+            ('detail', detail),
+        ])
+
+    return results
+
+
+class HealthMonitor(object):
+    """
+    Run the readiness checks in a background thread and keep the latest
+    result. The thread is started lazily, once per process.
+    """
+
+    def __init__(self, checks=CHECKS):
+        self.checks = checks
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._results = None
+        self._checked = None
+        self._checked_at = None
+
+    def ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._pid != pid or not self._thread.is_alive():
+                self._pid = pid
+                self._results = None
+                self._thread = threading.Thread(target=self.run,
+                    name='health-monitor')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def run(self):
+        while True:
+            self.update()
+            time.sleep(settings.HEALTH_CHECK_INTERVAL)
+
+    def update(self):
+        results = run_checks(self.checks)
+
+        failed = [name for name, r in results.items() if not r['ok']]
+        if failed:
+            logger.warning('Readiness checks failed: {}'.format(
+                ', '.join(failed)))
+
+        # Request threads read the three values together in `get_status`.
+        with self._lock:
+            self._results = results
+            self._checked = timezone.now()
+            self._checked_at = time.monotonic()
+
+    def get_status(self):
+        """
+        Return a `(ready, body)` tuple from the last result. Waits for the
+        first run when no result is available yet.
+        """
+        self.ensure_started()
+
+        if self._results is None:
+            self.update()
+
+        with self._lock:
+            results, checked = self._results, self._checked
+            checked_at = self._checked_at
+
+        age = time.monotonic() - checked_at
+        stale = age > settings.HEALTH_CHECK_MAX_AGE
+        ready = not stale and all(
+            r['ok'] for r in results.values() if r['critical'])
+
+        return ready, OrderedDict([
+            ('status', 'ready' if ready else 'unavailable'),
+            ('checked', checked.isoformat()),
+            ('age', round(age, 3)),
+            ('stale', stale),
+            ('checks', results),
+        ])
+
+
+monitor = HealthMonitor()
@@ -0,0 +1,278 @@
+"""
+Prometheus metrics for the web processes.
+
+When `prometheus_multiproc_dir` is set (see `config/gunicorn.py`) every
+worker writes its samples to that directory and `/metrics` aggregates them,
+otherwise the metrics of the current process are exported.
+"""
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+
+from django.db.backends.signals import connection_created
+from django.db.backends.utils import CursorWrapper
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+    CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+
+
+REQUESTS = Counter(
+    'gitos_http_requests_total',
+    'HTTP requests by view, method and status code.',
+    ['view', 'method', 'status']
+)
+LATENCY = Histogram(
+    'gitos_http_request_duration_seconds',
+    'HTTP request latency by view and status code.',
+    ['view', 'status'],
+    buckets=(.005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0,
+             10.0, float('inf'))
+)
+IN_FLIGHT = Gauge(
+    'gitos_http_requests_in_flight',
+    'HTTP requests being handled.',
+    multiprocess_mode='livesum'
+)
+DB_QUERIES = Histogram(
+    'gitos_http_db_queries',
+    'Database queries per HTTP request by view.',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, float('inf'))
+)
+REMOTE_TIME = Histogram(
+    'gitos_http_rehive_seconds',
+    'Time spent in Rehive calls per HTTP request by view.',
+    ['view'],
+    buckets=(0, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+)
+
+REHIVE_CALLS = Counter(
+    'gitos_rehive_calls_total',
+    'Rehive API calls by endpoint, method and outcome.',
+    ['endpoint', 'method', 'outcome']
+)
+REHIVE_LATENCY = Histogram(
+    'gitos_rehive_call_duration_seconds',
+    'Rehive API call latency by endpoint and method.',
+    ['endpoint', 'method'],
+    buckets=(.01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 30.0,
+             float('inf'))
+)
+REHIVE_REQUEST_BYTES = Counter(
+    'gitos_rehive_request_bytes_total',
+    'Bytes sent to the Rehive API by endpoint.',
+    ['endpoint']
+)
+REHIVE_RESPONSE_BYTES = Counter(
+    'gitos_rehive_response_bytes_total',
+    'Bytes received from the Rehive API by endpoint.',
+    ['endpoint']
+)
+REHIVE_RETRIES = Counter(
+    'gitos_rehive_retries_total',
+    'Retried Rehive API calls by endpoint.',
+    ['endpoint']
+)
+REHIVE_REJECTED = Counter(
+    'gitos_rehive_rejected_total',
+    'Rehive API calls rejected by the open circuit breaker by endpoint.',
+    ['endpoint']
+)
+REHIVE_BREAKER_STATE = Gauge(
+    'gitos_rehive_breaker_state',
+    'State of the Rehive circuit breaker (0 closed, 1 half-open, 2 open).',
+    multiprocess_mode='liveall'
+)
+
+BREAKER_STATES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+
+# Per thread state of the request being handled.
+_local = threading.local()
+
+
+def start_request():
+    _local.queries = 0
+    _local.remote_time = 0.0
+
+
+def finish_request():
+    queries = getattr(_local, 'queries', None)
+    remote_time = getattr(_local, 'remote_time', None)
+    _local.queries = None
+    _local.remote_time = None
+    return queries, remote_time
+
+
+def record_remote_call(endpoint, method, outcome, duration, sent, received):
+    """
+    Record a Rehive call, and add its duration to the current request.
+    """
+    REHIVE_CALLS.labels(endpoint, method, outcome).inc()
+    REHIVE_LATENCY.labels(endpoint, method).observe(duration)
+    REHIVE_REQUEST_BYTES.labels(endpoint).inc(sent)
+    REHIVE_RESPONSE_BYTES.labels(endpoint).inc(received)
+
+    if getattr(_local, 'remote_time', None) is not None:
+        _local.remote_time += duration
+
+
+@contextmanager
+def remote_wait():
+    """
+    Add the time spent in the block to the Rehive time of the current request.
+
+    Calls made from other threads (e.g. an executor) are not counted by
+    `record_remote_call`, wrap the code waiting on them instead.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if getattr(_local, 'remote_time', None) is not None:
+            _local.remote_time += time.perf_counter() - start
+
+
+def record_query():
+    """
+    Count a query of the current request. Returns the query profile when the
+    request is being profiled.
+    """
+    if getattr(_local, 'queries', None) is not None:
+        _local.queries += 1
+    return getattr(_local, 'profile', None)
+
+
+def get_query_count():
+    return getattr(_local, 'queries', None)
+
+
+def start_profile():
+    _local.profile = []
+
+
+def finish_profile():
+    """
+    Stop profiling and return the `(sql, duration)` of every query.
+    """
+    profile = getattr(_local, 'profile', None)
+    _local.profile = None
+    return profile
+
+
+def record_remote_retry(endpoint):
+    REHIVE_RETRIES.labels(endpoint).inc()
+
+
+def record_remote_rejection(endpoint):
+    REHIVE_REJECTED.labels(endpoint).inc()
+
+
+def record_breaker_state(state):
+    REHIVE_BREAKER_STATE.set(BREAKER_STATES[state])
+
+
+class CountingCursorWrapper(CursorWrapper):
+    """
+    Cursor wrapper counting the queries of the current request. Queries are
+    only timed while the request is being profiled.
+    """
+
+    def execute(self, sql, params=None):
+        profile = record_query()
+        if profile is None:
+            return super(CountingCursorWrapper, self).execute(sql, params)
+
+        start = time.perf_counter()
+        try:
+            return super(CountingCursorWrapper, self).execute(sql, params)
+        finally:
+            profile.append((sql, time.perf_counter() - start))
+
+    def executemany(self, sql, param_list):
+        profile = record_query()
+        if profile is None:
+            return super(CountingCursorWrapper, self).executemany(
+                sql, param_list)
+
+        start = time.perf_counter()
+        try:
+            return super(CountingCursorWrapper, self).executemany(
+                sql, param_list)
+        finally:
+            profile.append((sql, time.perf_counter() - start))
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """
+    Wrap the cursors of a new database connection.
+    """
+    if connection.__dict__.get('_counting_cursors'):
+        return
+
+    make_cursor = connection.make_cursor
+    make_debug_cursor = connection.make_debug_cursor
+
+    connection.make_cursor = lambda cursor: CountingCursorWrapper(
+        make_cursor(cursor), connection)
+    connection.make_debug_cursor = lambda cursor: CountingCursorWrapper(
+        make_debug_cursor(cursor), connection)
+    connection._counting_cursors = True
+
+
+connection_created.connect(install_query_counter)
+
+
+def get_view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.url_name or match.view_name or 'unnamed'
+
+
+def render_metrics():
+    """
+    Return the metrics of all workers in the Prometheus text format.
+    """
+    if 'prometheus_multiproc_dir' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware(object):
+    """
+    Record the count, latency, database queries and time spent in Rehive
+    calls of every request.
+    """
+
+    def process_request(self, request):
+        request._metrics_start = time.perf_counter()
+        IN_FLIGHT.inc()
+        start_request()
+
+    def process_response(self, request, response):
+        start = getattr(request, '_metrics_start', None)
+        if start is None:
+            # Short-circuited by an earlier middleware.
+            return response
+
+        request._metrics_start = None
+        IN_FLIGHT.dec()
+        queries, remote_time = finish_request()
+
+        view = get_view_name(request)
+        status = str(response.status_code)
+        REQUESTS.labels(view, request.method, status).inc()
+        LATENCY.labels(view, status).observe(time.perf_counter() - start)
+        if queries is not None:
+            DB_QUERIES.labels(view).observe(queries)
+            REMOTE_TIME.labels(view).observe(remote_time)
+
+        return response
@@ -1,4 +1,4 @@
-from django.http import HttpResponse, HttpResponseServerError
+from django.http import HttpResponse, JsonResponse
 from logging import getLogger
 logger = getLogger('django')
 
@@ -15,6 +15,8 @@ class HealthCheckMiddleware(object):
                 return self.readiness(request)
             elif request.path == "/healthz":
                 return self.healthz(request)
+            elif request.path == "/metrics":
+                return self.metrics(request)
 
     def healthz(self, request):
         """
@@ -22,21 +24,18 @@ class HealthCheckMiddleware(object):
         """
         return HttpResponse("OK")
 
-    def readiness(self, request):
-        # Connect to each database and do a generic standard SQL query
-        # that doesn't write any data and doesn't depend on any tables
-        # being present.
-        try:
-            from django.db import connections
-            for name in connections:
-                cursor = connections[name].cursor()
-                cursor.execute("SELECT 1;")
-                row = cursor.fetchone()
-                if row is None:
-                    return HttpResponseServerError("db: invalid response")
-
-        except Exception as e:
-            logger.exception(e)
-            return HttpResponseServerError("db: cannot connect to database.")
+    def metrics(self, request):
+        """
+        Returns the Prometheus metrics of all worker processes.
+        """
+        from config.metrics import render_metrics
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)
 
-        return HttpResponse("OK")
\ No newline at end of file
+    def readiness(self, request):
+        """
+        Returns the last result of the background readiness checks.
+        """
+        from config.health import monitor
+        ready, body = monitor.get_status()
+        return JsonResponse(body, status=200 if ready else 503)
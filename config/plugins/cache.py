@@ -0,0 +1,17 @@
+import os
+
+# CACHING
+# ---------------------------------------------------------------------------------------------------------------------
+
+# Currencies are cached per company in each process and validated against the
+# company's currencies digest, so syncs made by other processes are picked up.
+CURRENCY_CACHE_TTL = int(os.environ.get('CURRENCY_CACHE_TTL', 300))
+CURRENCY_CACHE_SIZE = int(os.environ.get('CURRENCY_CACHE_SIZE', 256))
+
+# Lifetime in seconds of cached responses per view, 0 disables caching. Cached
+# bounty responses are also invalidated whenever bounties change.
+RESPONSE_CACHE_TTLS = {
+    'root': int(os.environ.get('RESPONSE_CACHE_TTL_ROOT', 3600)),
+    'bounties': int(os.environ.get('RESPONSE_CACHE_TTL_BOUNTIES', 60)),
+    'bounty': int(os.environ.get('RESPONSE_CACHE_TTL_BOUNTY', 60)),
+}
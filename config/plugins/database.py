@@ -12,6 +12,9 @@ DATABASES = {
     }
 }
 
+# Connections are per thread and kept open for this many seconds, see
+# "Worker modes" in the README for the resulting number of connections.
 DATABASES['default'].update(
-    dj_database_url.config(conn_max_age=500)
+    dj_database_url.config(
+        conn_max_age=int(os.environ.get('DATABASE_CONN_MAX_AGE', 500)))
 )
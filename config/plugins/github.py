@@ -0,0 +1,25 @@
+import os
+
+# GITHUB WEBHOOKS
+# ---------------------------------------------------------------------------------------------------------------------
+
+# Pull request events are queued and processed by `./manage.py process_webhooks`.
+# Failed jobs are retried with exponential backoff (in seconds) until the
+# maximum number of attempts is reached.
+GITHUB_WEBHOOK_MAX_ATTEMPTS = int(os.environ.get('GITHUB_WEBHOOK_MAX_ATTEMPTS', 8))
+GITHUB_WEBHOOK_RETRY_DELAY = int(os.environ.get('GITHUB_WEBHOOK_RETRY_DELAY', 5))
+GITHUB_WEBHOOK_MAX_RETRY_DELAY = int(os.environ.get('GITHUB_WEBHOOK_MAX_RETRY_DELAY', 3600))
+
+# Seconds a claimed job is reserved for its worker. Jobs of a worker that dies
+# are picked up again once their lease expires, so it must be longer than a
+# batch takes to process.
+GITHUB_WEBHOOK_LEASE = int(os.environ.get('GITHUB_WEBHOOK_LEASE', 600))
+
+# Events received without an `X-GitHub-Delivery` header are treated as a
+# redelivery when the same pull request action was received less than this
+# many seconds ago.
+GITHUB_DELIVERY_DEDUPE_WINDOW = int(os.environ.get('GITHUB_DELIVERY_DEDUPE_WINDOW', 300))
+
+# Delivery records used to detect webhook redeliveries are removed by
+# `./manage.py prune_github_deliveries` once they are older than this.
+GITHUB_DELIVERY_RETENTION_DAYS = int(os.environ.get('GITHUB_DELIVERY_RETENTION_DAYS', 30))
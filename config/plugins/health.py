@@ -0,0 +1,15 @@
+import os
+
+# HEALTH CHECKS
+# ---------------------------------------------------------------------------------------------------------------------
+
+# Readiness checks run in a background thread in each process every
+# `HEALTH_CHECK_INTERVAL` seconds, probes are answered from the last result.
+# A result older than `HEALTH_CHECK_MAX_AGE` seconds is reported as not ready.
+HEALTH_CHECK_INTERVAL = float(os.environ.get('HEALTH_CHECK_INTERVAL', 10))
+HEALTH_CHECK_MAX_AGE = float(os.environ.get('HEALTH_CHECK_MAX_AGE', 60))
+HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', 2))
+
+# Fraction of the Rehive connection pool in use at which the pool check is
+# reported as failing. It does not affect readiness.
+HEALTH_POOL_SATURATION = float(os.environ.get('HEALTH_POOL_SATURATION', 1.0))
@@ -0,0 +1,9 @@
+import os
+
+# QUERY PROFILING
+# ---------------------------------------------------------------------------------------------------------------------
+
+# Fraction of requests whose SQL queries are timed. The slowest query
+# fingerprints of a profiled request are logged.
+QUERY_PROFILER_SAMPLE_RATE = float(os.environ.get('QUERY_PROFILER_SAMPLE_RATE', 0.01))
+QUERY_PROFILER_TOP_QUERIES = int(os.environ.get('QUERY_PROFILER_TOP_QUERIES', 5))
@@ -0,0 +1,55 @@
+import os
+
+# REHIVE ~ https://docs.rehive.com/
+# ---------------------------------------------------------------------------------------------------------------------
+
+# Verified tokens are cached (keyed by a hash of the token) to avoid a Rehive
+# round trip on every authenticated request.
+REHIVE_TOKEN_CACHE_TTL = int(os.environ.get('REHIVE_TOKEN_CACHE_TTL', 60))
+REHIVE_TOKEN_CACHE_NEGATIVE_TTL = int(os.environ.get('REHIVE_TOKEN_CACHE_NEGATIVE_TTL', 5))
+REHIVE_TOKEN_CACHE_SIZE = int(os.environ.get('REHIVE_TOKEN_CACHE_SIZE', 1024))
+
+# All Rehive calls share a per-process, keep-alive connection pool. With
+# threaded workers every thread may make up to two concurrent calls (during
+# activation), the pool is sized so that connections are not discarded.
+REHIVE_API_URL = os.environ.get('REHIVE_API_URL', 'https://api.rehive.com/3/')
+REHIVE_POOL_SIZE = int(os.environ.get('REHIVE_POOL_SIZE',
+    max(10, 2 * int(os.environ.get('GUNICORN_THREADS', 1)))))
+REHIVE_CONNECT_TIMEOUT = float(os.environ.get('REHIVE_CONNECT_TIMEOUT', 3.05))
+REHIVE_READ_TIMEOUT = float(os.environ.get('REHIVE_READ_TIMEOUT', 10))
+
+# Timeouts (connect, read) of specific operations, keyed by method and
+# endpoint. Token checks run on most requests and must fail fast.
+REHIVE_OPERATION_TIMEOUTS = {
+    'GET user/': (
+        REHIVE_CONNECT_TIMEOUT,
+        float(os.environ.get('REHIVE_USER_READ_TIMEOUT', 3))
+    ),
+    'GET company/currencies/': (
+        REHIVE_CONNECT_TIMEOUT,
+        float(os.environ.get('REHIVE_CURRENCIES_READ_TIMEOUT', 15))
+    ),
+    'POST admin/transactions/credit/': (
+        REHIVE_CONNECT_TIMEOUT,
+        float(os.environ.get('REHIVE_TRANSACTION_READ_TIMEOUT', 15))
+    ),
+    'PATCH admin/transactions/{id}/': (
+        REHIVE_CONNECT_TIMEOUT,
+        float(os.environ.get('REHIVE_TRANSACTION_READ_TIMEOUT', 15))
+    ),
+}
+
+# GET calls failing with a network or server error are retried with
+# exponential backoff and full jitter (delays in seconds).
+REHIVE_RETRIES = int(os.environ.get('REHIVE_RETRIES', 2))
+REHIVE_RETRY_DELAY = float(os.environ.get('REHIVE_RETRY_DELAY', 0.1))
+REHIVE_MAX_RETRY_DELAY = float(os.environ.get('REHIVE_MAX_RETRY_DELAY', 1))
+
+# After this many consecutive failed calls, Rehive calls fail fast with a 503
+# for `REHIVE_BREAKER_RESET_TIMEOUT` seconds before a trial call is let
+# through.
+REHIVE_BREAKER_THRESHOLD = int(os.environ.get('REHIVE_BREAKER_THRESHOLD', 5))
+REHIVE_BREAKER_RESET_TIMEOUT = int(os.environ.get('REHIVE_BREAKER_RESET_TIMEOUT', 30))
+
+# Rehive calls taking longer than this (in seconds) are logged as warnings.
+REHIVE_SLOW_CALL_THRESHOLD = float(os.environ.get('REHIVE_SLOW_CALL_THRESHOLD', 1))
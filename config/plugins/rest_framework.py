@@ -1,16 +1,36 @@
+import os
+
 from rest_framework.settings import reload_api_settings
 
 ANONYMOUS_USER_ID = -1
 
 CORS_ORIGIN_ALLOW_ALL = True
 
+# Query profile headers added to admin responses, see `config.profiling`.
+CORS_EXPOSE_HEADERS = ('X-DB-Queries', 'X-DB-Time')
+
 # REST FRAMEWORK ~ http://www.django-rest-framework.org/
 # ---------------------------------------------------------------------------------------------------------------------
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'gitos.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'gitos.renderers.MessagePackRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'gitos.parsers.MessagePackParser',
+    ),
     'EXCEPTION_HANDLER': 'config.exceptions.custom_exception_handler',
 }
 
+# Pagination style for list views supporting several (`page` or `cursor`),
+# overridden per request with `?pagination=<style>`.
+DEFAULT_PAGINATION_STYLE = os.environ.get('DEFAULT_PAGINATION_STYLE', 'page')
+
 reload_api_settings(setting='REST_FRAMEWORK', value=REST_FRAMEWORK)
@@ -0,0 +1,97 @@
+"""
+Sampled SQL query profiling.
+
+Queries are counted for every request by the cursor wrapper in
+`config.metrics`, sampled requests also time them. Profiles are logged by
+query fingerprint, so that N+1 patterns show up as one fingerprint executed
+many times.
+"""
+import random
+import re
+
+from collections import OrderedDict
+from logging import getLogger
+
+from django.conf import settings
+
+from config.metrics import (
+    finish_profile, get_query_count, get_view_name, start_profile
+)
+
+logger = getLogger('django')
+
+
+def get_fingerprint(sql):
+    """
+    Normalize a query by replacing literals and placeholder lists.
+    """
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+\b', '?', sql)
+    sql = re.sub(r'%s', '?', sql)
+    sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)*\s*\)', '(...)', sql)
+    sql = re.sub(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+', '(...)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def summarize_profile(profile):
+    """
+    Group a profile by fingerprint, slowest total time first.
+    """
+    fingerprints = OrderedDict()
+    for sql, duration in profile:
+        fingerprint = get_fingerprint(sql)
+        count, total = fingerprints.get(fingerprint, (0, 0.0))
+        fingerprints[fingerprint] = (count + 1, total + duration)
+
+    return sorted(fingerprints.items(), key=lambda i: i[1][1], reverse=True)
+
+
+def log_profile(view, profile):
+    summary = summarize_profile(profile)
+    total = sum(duration for sql, duration in profile)
+
+    lines = ['Query profile {}: {} queries, {:.1f}ms'.format(
+        view, len(profile), total * 1000)]
+    for fingerprint, (count, duration) in summary[
+            :settings.QUERY_PROFILER_TOP_QUERIES]:
+        lines.append('  {:>4}x {:>8.1f}ms {}'.format(
+            count, duration * 1000, fingerprint))
+
+    logger.info('\n'.join(lines))
+
+
+class QueryProfilerMiddleware(object):
+    """
+    Time the queries of a sample of requests. Admin callers get the number of
+    queries, and the query time in milliseconds of sampled requests, in the
+    `X-DB-Queries` and `X-DB-Time` headers.
+    """
+
+    def process_request(self, request):
+        request._profile_queries = (
+            random.random() < settings.QUERY_PROFILER_SAMPLE_RATE)
+        if request._profile_queries:
+            start_profile()
+
+    def process_response(self, request, response):
+        sampled = getattr(request, '_profile_queries', None)
+        if sampled is None:
+            # Short-circuited by an earlier middleware.
+            return response
+
+        request._profile_queries = None
+        profile = finish_profile() if sampled else None
+
+        # Set by `AdminAuthentication`.
+        if getattr(request, 'show_query_profile', False):
+            queries = get_query_count()
+            if queries is not None:
+                response['X-DB-Queries'] = str(queries)
+            if profile is not None:
+                response['X-DB-Time'] = '{:.3f}'.format(
+                    sum(duration for sql, duration in profile) * 1000)
+
+        if profile:
+            log_profile(get_view_name(request), profile)
+
+        return response
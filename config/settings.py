@@ -10,6 +10,11 @@ import os
 from .plugins.secrets import *
 from .plugins.rest_framework import *
 from .plugins.database import *
+from .plugins.rehive import *
+from .plugins.github import *
+from .plugins.cache import *
+from .plugins.health import *
+from .plugins.profiling import *
 
 
 # Project paths
@@ -46,6 +51,8 @@ INSTALLED_APPS = [
 MIDDLEWARE_CLASSES = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'config.middleware.HealthCheckMiddleware',
+    'config.metrics.MetricsMiddleware',
+    'config.profiling.QueryProfilerMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -60,6 +67,18 @@ MIDDLEWARE_CLASSES = [
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# The API is token authenticated and stateless, its routes run through this
+# shorter chain (see `config.handlers`). Set to None to use the full chain.
+API_MIDDLEWARE_PREFIXES = ['/api/']
+
+API_MIDDLEWARE_CLASSES = [
+    'config.metrics.MetricsMiddleware',
+    'config.profiling.QueryProfilerMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
 INTERNAL_IPS = ['127.0.0.1']
 
 ROOT_URLCONF = 'config.urls'
@@ -145,3 +164,37 @@ SITE_ID = 1
 FIXTURE_DIRS = ['config/fixtures']
 
 CACHE_DIR = os.path.join(PROJECT_DIR, 'var/cache')
+
+# Caching
+# ---------------------------------------------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/1.9/topics/cache/
+# Select the backend with CACHE_BACKEND. Cache tags are invalidated through the
+# cache, so with several processes use a shared backend: `memcached` (the
+# default when MEMCACHED_LOCATION is set) or `db`. The database backend costs a
+# query per read and counts its table on every write, and needs a
+# `./manage.py createcachetable` first. `locmem` (the default otherwise) only
+# works with a single process and `file` with a single host.
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+    },
+    'memcached': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': os.environ.get('MEMCACHED_LOCATION',
+            '127.0.0.1:11211').split(','),
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'gitos_cache',
+    },
+}
+
+CACHES = {
+    'default': CACHE_BACKENDS[os.environ.get('CACHE_BACKEND',
+        'memcached' if os.environ.get('MEMCACHED_LOCATION') else 'locmem')],
+}
@@ -1,14 +1,77 @@
+import hashlib
 import uuid
 import os
 
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
-from django.utils.encoding import smart_text
+from django.utils.encoding import smart_bytes, smart_text
 from rest_framework import authentication, exceptions
-from rehive import Rehive, APIException
+from rehive import APIException
 
+from .cache import LRUCache
+from .clients import get_rehive
 from .models import Company, User
 
 
+# Marker stored in the token cache for tokens rejected by Rehive.
+REJECTED = object()
+
+token_cache = LRUCache(
+    maxsize=settings.REHIVE_TOKEN_CACHE_SIZE,
+    ttl=settings.REHIVE_TOKEN_CACHE_TTL)
+
+
+def hash_token(token):
+    return hashlib.sha256(smart_bytes(token)).hexdigest()
+
+
+def get_rehive_user(token):
+    """
+    Verify a token with Rehive and return the user's identifier, groups and
+    company. Successful lookups and rejected tokens are cached per process,
+    keyed by a hash of the token, so that the raw token is never stored.
+    """
+    if not token:
+        raise APIException('Authentication credentials were not provided.',
+            401)
+
+    key = hash_token(token)
+    user = token_cache.get(key)
+
+    if user is REJECTED:
+        raise APIException('Invalid token.', 401)
+    elif user is not None:
+        return user
+
+    rehive = get_rehive(token)
+
+    try:
+        user = rehive.user.get()
+    except APIException as exc:
+        # Only cache definite rejections, not network or server errors.
+        if exc.status_code in (401, 403):
+            token_cache.set(key, REJECTED,
+                ttl=settings.REHIVE_TOKEN_CACHE_NEGATIVE_TTL)
+        raise
+
+    user = {
+        'identifier': user['identifier'],
+        'groups': [g['name'] for g in user['groups']],
+        'company': user['company'],
+    }
+    token_cache.set(key, user)
+
+    return user
+
+
+def invalidate_company_tokens(identifier):
+    """
+    Drop all cached tokens belonging to a company.
+    """
+    return token_cache.delete_where(
+        lambda user: user is not REJECTED and user['company'] == identifier)
+
+
 class HeaderAuthentication(authentication.BaseAuthentication):
     """
     Authentication utility class.
@@ -41,18 +104,17 @@ class AdminAuthentication(HeaderAuthentication):
         else:
             token = self.get_auth_header(request)
 
-        rehive = Rehive(token)
-
         try:
-            user = rehive.user.get()
-            groups = [g['name'] for g in user['groups']]
+            user = get_rehive_user(token)
+            groups = user['groups']
             if len(set(["admin", "service"]).intersection(groups)) <= 0:
                 raise exceptions.AuthenticationFailed(_('Invalid admin user'))
         except APIException:
             raise exceptions.AuthenticationFailed(_('Invalid user'))
 
         try:
-            company = Company.objects.get(identifier=user['company'])
+            company = Company.objects.select_related('admin').get(
+                identifier=user['company'])
         except Company.DoesNotExist:
             raise exceptions.AuthenticationFailed(
                 _("Inactive company. Please activate the company first."))
@@ -61,6 +123,9 @@ class AdminAuthentication(HeaderAuthentication):
             identifier=uuid.UUID(user['identifier']).hex,
             company=company)
 
+        # Admin callers can see the query profile of their requests.
+        request._request.show_query_profile = True
+
         # Return the permanent token for (not the request token) the company.
         return user, company.admin.token
 
@@ -74,10 +139,8 @@ class UserAuthentication(HeaderAuthentication):
         token = self.get_auth_header(request)
         # token = "" #Overide token for testing
 
-        rehive = Rehive(token)
-
         try:
-            user = rehive.user.get()
+            user = get_rehive_user(token)
         except APIException:
             raise exceptions.AuthenticationFailed(_('Invalid user'))
 
@@ -0,0 +1,91 @@
+import math
+import threading
+import time
+
+
+class CircuitBreaker(object):
+    """
+    Thread-safe circuit breaker.
+
+    Opens after `threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds. A single trial call is then let through
+    (half-open), which closes the breaker when it succeeds and opens it again
+    when it fails. `on_change` is called with the new state on every
+    transition.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold=5, reset_timeout=30, on_change=None):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_started = None
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def _set_state(self, state):
+        if state == self._state:
+            return
+        self._state = state
+        if self.on_change is not None:
+            self.on_change(state)
+
+    def allow(self):
+        """
+        Return whether a call may be made now.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN:
+                if now - self._opened_at < self.reset_timeout:
+                    return False
+                self._set_state(self.HALF_OPEN)
+                self._trial_started = now
+                return True
+
+            # Half-open: only one trial at a time, unless it never reported.
+            if now - self._trial_started >= self.reset_timeout:
+                self._trial_started = now
+                return True
+            return False
+
+    def retry_after(self):
+        """
+        Seconds until the next trial call is let through.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return 0
+            start = self._opened_at if self._state == self.OPEN \
+                else self._trial_started
+            remaining = self.reset_timeout - (time.monotonic() - start)
+            return max(int(math.ceil(remaining)), 1)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if (self._state == self.HALF_OPEN or
+                    self._failures >= self.threshold):
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def get_status(self):
+        with self._lock:
+            return {'state': self._state, 'failures': self._failures}
@@ -0,0 +1,163 @@
+import hashlib
+import threading
+import time
+import uuid
+
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class LRUCache(object):
+    """
+    Thread-safe, size bounded in-process cache with per entry expiry.
+
+    Entries are evicted in least recently used order once `maxsize` is
+    reached. Expired entries are dropped lazily when they are read.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return default
+
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """
+        Remove all entries whose value matches `predicate`.
+        """
+        with self._lock:
+            keys = [k for k, (e, v) in self._data.items() if predicate(v)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def get_tag_versions(tags, request=None):
+    """
+    Return the current version of each tag. Tags without a version get one.
+
+    With a `request`, versions are read once and reused for the rest of the
+    request, e.g. by both the ETag and the response cache key.
+    """
+    keys = ['tag:{}'.format(tag) for tag in tags]
+    seen = getattr(request, '_tag_versions', {})
+    versions = {key: seen[key] for key in keys if key in seen}
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        versions.update(cache.get_many(missing))
+
+    for key in missing:
+        if key not in versions:
+            versions[key] = uuid.uuid4().hex
+            cache.add(key, versions[key], None)
+            versions[key] = cache.get(key, versions[key])
+
+    if request is not None:
+        seen.update(versions)
+        request._tag_versions = seen
+
+    return [versions[key] for key in keys]
+
+
+def invalidate_tags(*tags):
+    """
+    Invalidate all cached responses tagged with any of `tags` once the current
+    transaction commits, so that no response is cached from the old data.
+    """
+    transaction.on_commit(lambda: cache.set_many(
+        {'tag:{}'.format(tag): uuid.uuid4().hex for tag in tags}, None))
+
+
+def get_response_cache_key(request, name, tags=()):
+    """
+    Build a cache key from the view name, the versions of its tags, the
+    tenant, the absolute URL with sorted query parameters and the accepted
+    media type.
+    """
+    user = getattr(request, 'user', None)
+    query = sorted(request.query_params.lists())
+    key = '|'.join([
+        str(getattr(user, 'company_id', '') or ''),
+        request.build_absolute_uri(request.path),
+        repr(query),
+        request.accepted_media_type or '',
+    ] + get_tag_versions(tags, request))
+
+    return 'response:{}:{}'.format(
+        name, hashlib.md5(key.encode('utf-8')).hexdigest())
+
+
+def cache_response(name, tags=()):
+    """
+    Cache successful GET responses of a view (method or function) for the
+    number of seconds configured in `RESPONSE_CACHE_TTLS[name]`.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            request = args[0] if isinstance(args[0], Request) else args[1]
+            ttl = settings.RESPONSE_CACHE_TTLS.get(name, 0)
+
+            if request.method != 'GET' or ttl <= 0:
+                return func(*args, **kwargs)
+
+            key = get_response_cache_key(request, name, tags)
+            cached = cache.get(key)
+            if cached is not None:
+                data, status = cached
+                return Response(data, status=status)
+
+            response = func(*args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, (response.data, response.status_code), ttl)
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,251 @@
+import os
+import random
+import re
+import threading
+import time
+
+from http.cookiejar import DefaultCookiePolicy
+from logging import getLogger
+
+import requests
+from django.conf import settings
+from django.utils.translation import ugettext_lazy as _
+from rehive import APIException, Rehive as BaseRehive
+from rehive.api.client import Client as BaseClient
+from rehive.api.rehive_util import RehiveUtil
+from rehive.api.resources.accounts_resources import APIAccounts
+from rehive.api.resources.admin_resources import AdminResources
+from rehive.api.resources.auth_resources import AuthResources
+from rehive.api.resources.company_resources import APICompany
+from rehive.api.resources.transaction_resource import APITransactions
+from rehive.api.resources.user_resources import UserResources
+
+from config.exceptions import ServiceUnavailable
+from config.metrics import (
+    record_breaker_state, record_remote_call, record_remote_rejection,
+    record_remote_retry
+)
+from gitos.breaker import CircuitBreaker
+
+logger = getLogger('django')
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def create_session():
+    session = requests.Session()
+    # Sessions are shared between tokens, never keep cookies around.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.REHIVE_POOL_SIZE
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session():
+    """
+    Return the process wide Rehive session. A new session is created after a
+    fork (e.g. in every gunicorn worker) so that worker processes never share
+    sockets with their parent.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = create_session()
+                _session_pid = pid
+
+    return _session
+
+
+def log_breaker_state(state):
+    record_breaker_state(state)
+    if state == CircuitBreaker.CLOSED:
+        logger.info('Rehive circuit breaker closed')
+    else:
+        logger.warning('Rehive circuit breaker {}'.format(state))
+
+
+# Calls fail fast while Rehive keeps failing, see `Client._request`.
+breaker = CircuitBreaker(
+    threshold=settings.REHIVE_BREAKER_THRESHOLD,
+    reset_timeout=settings.REHIVE_BREAKER_RESET_TIMEOUT,
+    on_change=log_breaker_state
+)
+record_breaker_state(breaker.state)
+
+
+def get_endpoint(path):
+    """
+    Normalize a Rehive API path, replacing identifiers and dropping the query
+    string, e.g. `admin/users/{id}/`.
+    """
+    path = path.split('?', 1)[0]
+    return '/'.join(
+        '{id}' if re.search(r'\d', segment) else segment
+        for segment in path.split('/')
+    )
+
+
+def is_retryable(exc):
+    """
+    Network errors, timeouts and gateway errors are worth retrying.
+    """
+    return exc.status_code is None or exc.status_code in (500, 502, 503, 504)
+
+
+def get_retry_delay(attempt):
+    """
+    Exponential backoff with full jitter for the `attempt`th retry.
+    """
+    return random.uniform(0, min(
+        settings.REHIVE_RETRY_DELAY * 2 ** (attempt - 1),
+        settings.REHIVE_MAX_RETRY_DELAY))
+
+
+def get_outcome(exc):
+    """
+    Classify a failed call.
+    """
+    if exc.status_code is None:
+        return 'network_error'
+    if exc.status_code >= 500:
+        return 'server_error'
+    return 'client_error'
+
+
+class Client(BaseClient):
+    """
+    Rehive API client using the pooled, keep-alive session. Auth headers
+    are built per call, so one connection pool serves every token.
+
+    Calls are guarded by the process wide circuit breaker, and reads that
+    fail with a network or server error are retried.
+    """
+
+    def __init__(self, token=None, timeout=None):
+        super(Client, self).__init__(token,
+            api_endpoint_url=settings.REHIVE_API_URL)
+        self.timeout = timeout
+
+    def _create_session(self):
+        self._session = get_session()
+
+    def get_timeout(self, method, endpoint):
+        """
+        Return the (connect, read) timeout of an operation.
+        """
+        if self.timeout is not None:
+            return self.timeout
+
+        return settings.REHIVE_OPERATION_TIMEOUTS.get(
+            '{} {}'.format(method, endpoint),
+            (settings.REHIVE_CONNECT_TIMEOUT, settings.REHIVE_READ_TIMEOUT))
+
+    def _request(self, method, path, data=None, json=True, headers=None,
+                 idempotent_key=None, **kwargs):
+        endpoint = get_endpoint(path)
+        kwargs.setdefault('timeout', self.get_timeout(method.upper(), endpoint))
+        retries = settings.REHIVE_RETRIES if method.upper() == 'GET' else 0
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                record_remote_rejection(endpoint)
+                raise ServiceUnavailable(_('Rehive is unavailable.'),
+                    wait=breaker.retry_after())
+
+            try:
+                return self._call(method, path, data, json=json,
+                    headers=headers, idempotent_key=idempotent_key, **kwargs)
+            except APIException as exc:
+                if attempt >= retries or not is_retryable(exc):
+                    raise
+
+            attempt += 1
+            record_remote_retry(endpoint)
+            time.sleep(get_retry_delay(attempt))
+
+    def _call(self, method, path, data=None, json=True, headers=None,
+              idempotent_key=None, **kwargs):
+        """
+        Make a single call, and record its outcome.
+        """
+        sizes = {'sent': 0, 'received': 0}
+        outcome, status_code = 'error', None
+
+        def record_sizes(response, *args, **kwargs):
+            body = response.request.body or b''
+            sizes['sent'] = len(body.encode('utf-8')
+                if isinstance(body, str) else body)
+            sizes['received'] = len(response.content)
+
+        start = time.perf_counter()
+        try:
+            # Always pass a fresh dict, the base client mutates its default.
+            result = super(Client, self)._request(method, path, data,
+                json=json, headers=dict(headers or {}),
+                idempotent_key=idempotent_key,
+                hooks={'response': record_sizes}, **kwargs)
+            outcome = 'success'
+            return result
+        except APIException as exc:
+            outcome, status_code = get_outcome(exc), exc.status_code
+            raise
+        finally:
+            if outcome in ('success', 'client_error'):
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            self._record(method, path, time.perf_counter() - start, outcome,
+                status_code, sizes['sent'], sizes['received'])
+
+    def _record(self, method, path, duration, outcome, status_code, sent,
+                received):
+        """
+        Record the metrics of a call and log it when it is slow.
+        """
+        endpoint = get_endpoint(path)
+        method = method.upper()
+
+        record_remote_call(endpoint, method, outcome, duration, sent,
+            received)
+
+        message = 'Rehive {} {} {}{} {:.3f}s {} bytes sent {} received'.format(
+            method, endpoint, outcome,
+            ' ({})'.format(status_code) if status_code else '', duration,
+            sent, received)
+        if duration >= settings.REHIVE_SLOW_CALL_THRESHOLD:
+            logger.warning('Slow ' + message)
+        else:
+            logger.debug(message)
+
+
+class Rehive(BaseRehive):
+
+    def __init__(self, token=None, timeout=None):
+        self.client = Client(token, timeout=timeout)
+        self.admin = AdminResources(self.client)
+        self.auth = AuthResources(self.client)
+        self.util = RehiveUtil(self.client)
+        self.user = UserResources(self.client)
+        self.transactions = APITransactions(self.client)
+        self.accounts = APIAccounts(self.client)
+        self.company = APICompany(self.client)
+
+
+def get_rehive(token=None, timeout=None):
+    """
+    Return a Rehive SDK instance for `token` backed by the shared session.
+    `timeout` is a (connect, read) tuple overriding the configured timeouts
+    of every operation.
+    """
+    return Rehive(token, timeout=timeout)
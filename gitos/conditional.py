@@ -0,0 +1,90 @@
+import calendar
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_http_date_safe
+
+from config.exceptions import NotModified
+
+
+def get_queryset_state(queryset):
+    """
+    Return the latest `updated` value and the row count of a queryset.
+    """
+    state = queryset.order_by().aggregate(
+        last_modified=Max('updated'), count=Count('id'))
+    return state['last_modified'], state['count']
+
+
+def is_not_modified(request, etag, last_modified):
+    """
+    Check the conditional headers of a request. `If-None-Match` takes
+    precedence over `If-Modified-Since`.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = [e.strip() for e in if_none_match.split(',')]
+        return '*' in etags or etag in etags or 'W/' + etag in etags
+
+    if_modified_since = parse_http_date_safe(
+        request.META.get('HTTP_IF_MODIFIED_SINCE') or '')
+    if if_modified_since and last_modified:
+        return calendar.timegm(last_modified.utctimetuple()) <= if_modified_since
+
+    return False
+
+
+class ConditionalMixin(object):
+    """
+    Add `ETag` and `Last-Modified` headers to GET responses and answer
+    matching conditional requests with a 304 before any serializer runs.
+
+    Validators are built from the state returned by `get_validator_state()`.
+    It runs on every GET before the view, so views should override it with a
+    cheap state (e.g. a cache tag version) rather than aggregate their rows.
+    """
+    etag = None
+    last_modified = None
+
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    def get_validator_state(self):
+        """
+        Return the (last modified, version) state of the resource. Both values
+        are part of the ETag, `If-Modified-Since` is only answered when last
+        modified is set.
+        """
+        return get_queryset_state(self.get_validator_queryset())
+
+    def initial(self, request, *args, **kwargs):
+        super(ConditionalMixin, self).initial(request, *args, **kwargs)
+
+        if request.method not in ('GET', 'HEAD'):
+            return
+
+        last_modified, version = self.get_validator_state()
+        key = ':'.join([
+            request.get_full_path(),
+            request.accepted_media_type or '',
+            last_modified.isoformat() if last_modified else '',
+            str(version),
+        ])
+        self.etag = '"{}"'.format(
+            hashlib.md5(key.encode('utf-8')).hexdigest())
+        self.last_modified = last_modified
+
+        if is_not_modified(request, self.etag, last_modified):
+            raise NotModified()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(ConditionalMixin, self).finalize_response(
+            request, response, *args, **kwargs)
+
+        if self.etag and response.status_code in (200, 304):
+            response['ETag'] = self.etag
+            if self.last_modified:
+                response['Last-Modified'] = http_date(
+                    calendar.timegm(self.last_modified.utctimetuple()))
+
+        return response
@@ -0,0 +1,177 @@
+import hashlib
+import json
+
+from collections import OrderedDict
+from logging import getLogger
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from gitos.cache import LRUCache
+from gitos.clients import get_rehive
+from gitos.models import Company, Currency
+
+logger = getLogger('django')
+
+
+CURRENCY_FIELDS = ('description', 'symbol', 'unit', 'divisibility', 'enabled')
+
+currency_cache = LRUCache(
+    maxsize=settings.CURRENCY_CACHE_SIZE,
+    ttl=settings.CURRENCY_CACHE_TTL)
+
+
+def load_company_currencies(company):
+    """
+    Return the cached (currencies, last modified) entry of a company.
+
+    Entries are validated against `company.currencies_digest`, which changes
+    whenever currencies are synced. Syncs made by other processes (e.g. the
+    `sync_currencies` command) are therefore seen on the next request.
+    """
+    entry = currency_cache.get(company.id)
+
+    if entry is None or entry[0] != company.currencies_digest:
+        columns = ('code',) + CURRENCY_FIELDS
+        rows = list(Currency.objects.filter(company=company).order_by(
+            'id').values_list('updated', *columns))
+        currencies = OrderedDict(
+            (row[1].upper(), OrderedDict(zip(columns, row[1:])))
+            for row in rows)
+        last_modified = max([row[0] for row in rows], default=None)
+        entry = (company.currencies_digest, currencies, last_modified)
+        currency_cache.set(company.id, entry)
+
+    return entry[1:]
+
+
+def get_company_currencies(company):
+    """
+    Return a company's currencies keyed by upper case code, in the format of
+    `CurrencySerializer`. Results are cached per process, see
+    `load_company_currencies`.
+    """
+    return load_company_currencies(company)[0]
+
+
+def get_company_currencies_state(company):
+    """
+    Return the (last modified, count) state of the cached currencies.
+    """
+    currencies, last_modified = load_company_currencies(company)
+    return last_modified, len(currencies)
+
+
+def invalidate_company_currencies(company):
+    currency_cache.delete(company.id)
+
+
+def fetch_currencies(rehive):
+    """
+    Return all currencies of a Rehive company, following pagination.
+    """
+    resource = rehive.company.currencies
+    currencies = list(resource.get())
+    while resource.next:
+        currencies.extend(resource.get_next())
+    return currencies
+
+
+def get_currency_values(currency):
+    values = {f: currency[f] for f in CURRENCY_FIELDS if f in currency}
+    values.setdefault('enabled', True)
+    return values
+
+
+def get_digest(currencies):
+    currencies = sorted(
+        ([c['code'], get_currency_values(c)] for c in currencies),
+        key=lambda c: c[0])
+    return hashlib.sha256(
+        json.dumps(currencies, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def bulk_update_currencies(currencies):
+    """
+    Write the code and `CURRENCY_FIELDS` of several currencies in one UPDATE
+    statement.
+    """
+    if not currencies:
+        return
+
+    rows = []
+    params = []
+    for currency in currencies:
+        rows.append('(%s::integer, %s::varchar, %s::varchar, %s::varchar, '
+                    '%s::varchar, %s::integer, %s::boolean)')
+        params.extend([currency.id, currency.code] + [
+            getattr(currency, f) for f in CURRENCY_FIELDS])
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE {table} AS c SET code = v.code, '
+            'description = v.description, symbol = v.symbol, unit = v.unit, '
+            'divisibility = v.divisibility, enabled = v.enabled, updated = %s '
+            'FROM (VALUES {rows}) AS v(id, code, description, symbol, unit, '
+            'divisibility, enabled) '
+            'WHERE c.id = v.id'.format(
+                table=Currency._meta.db_table, rows=', '.join(rows)),
+            [timezone.now()] + params
+        )
+
+
+def sync_company_currencies(company, rehive=None):
+    """
+    Bring the local currencies of a company in line with Rehive.
+
+    New currencies are inserted, changed ones updated and currencies removed
+    from Rehive disabled, each with a single statement. When the remote
+    currencies hash to the stored watermark the local rows are not read at
+    all. Returns a (created, updated, disabled) tuple, or `None` when nothing
+    changed.
+    """
+    rehive = rehive or get_rehive(company.admin.token)
+    remote = fetch_currencies(rehive)
+    digest = get_digest(remote)
+    now = timezone.now()
+
+    if digest == company.currencies_digest:
+        Company.objects.filter(pk=company.pk).update(currencies_synced=now)
+        return None
+
+    with transaction.atomic():
+        # Codes are unique per company regardless of case, so a code whose
+        # case changed on Rehive updates the existing row.
+        local = {c.code.upper(): c
+                 for c in Currency.objects.filter(company=company)}
+        remote = {c['code'].upper(): (c['code'], get_currency_values(c))
+                  for c in remote}
+
+        created = []
+        updated = []
+        for key, (code, values) in remote.items():
+            currency = local.get(key)
+            if currency is None:
+                created.append(Currency(company=company, code=code, **values))
+            elif currency.code != code or any(
+                    getattr(currency, k) != v for k, v in values.items()):
+                currency.code = code
+                for k, v in values.items():
+                    setattr(currency, k, v)
+                updated.append(currency)
+
+        disabled = [c.id for key, c in local.items()
+                    if key not in remote and c.enabled]
+
+        Currency.objects.bulk_create(created)
+        bulk_update_currencies(updated)
+        Currency.objects.filter(id__in=disabled).update(
+            enabled=False, updated=now)
+
+        Company.objects.filter(pk=company.pk).update(
+            currencies_digest=digest, currencies_synced=now)
+
+    invalidate_company_currencies(company)
+
+    return len(created), len(updated), len(disabled)
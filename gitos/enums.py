@@ -4,3 +4,9 @@ from enumfields.enums import Enum
 class GithubIssueBountyStatus(Enum):
     OPEN = 'open'
     CLOSED = 'closed'
+
+
+class WebhookJobStatus(Enum):
+    PENDING = 'pending'
+    COMPLETE = 'complete'
+    FAILED = 'failed'
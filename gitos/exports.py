@@ -0,0 +1,95 @@
+import csv
+
+from django.http import StreamingHttpResponse
+from rest_framework import exceptions
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.utils.encoders import JSONEncoder
+
+
+CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    Exports pick their own content type, so never reject a request because of
+    its `Accept` header.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+class Echo(object):
+    """
+    File-like object that returns what is written to it, for `csv.writer`.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iterate_rows(queryset, columns, chunk_size=CHUNK_SIZE):
+    """
+    Yield `columns` for every row of a queryset in primary key order.
+
+    Rows are fetched in chunks with keyset queries on the primary key, so
+    memory use does not grow with the size of the table.
+    """
+    queryset = queryset.order_by('pk').values_list('pk', *columns)
+    last = None
+
+    while True:
+        chunk = queryset if last is None else queryset.filter(pk__gt=last)
+        count = 0
+
+        for row in chunk[:chunk_size].iterator():
+            count += 1
+            last = row[0]
+            yield row[1:]
+
+        if count < chunk_size:
+            break
+
+
+def ndjson_lines(rows, serializer):
+    encoder = JSONEncoder()
+    for row in rows:
+        yield encoder.encode(serializer.to_representation(row)) + '\n'
+
+
+def csv_lines(rows, serializer):
+    writer = csv.writer(Echo())
+    yield writer.writerow(serializer.names)
+    for row in rows:
+        yield writer.writerow(
+            serializer.to_representation(row).values())
+
+
+def stream_export(request, queryset, serializer, name):
+    """
+    Stream all rows of a queryset as newline delimited JSON (the default) or
+    CSV, selected with `?format=ndjson|csv`.
+    """
+    output = request.query_params.get('format', 'ndjson')
+
+    if output not in CONTENT_TYPES:
+        raise exceptions.ValidationError(
+            {'format': ['Select one of: {}.'.format(
+                ', '.join(sorted(CONTENT_TYPES)))]})
+
+    rows = iterate_rows(queryset, serializer.columns)
+    lines = ndjson_lines if output == 'ndjson' else csv_lines
+
+    response = StreamingHttpResponse(lines(rows, serializer),
+        content_type=CONTENT_TYPES[output])
+    response['Content-Disposition'] = 'attachment; filename="{}.{}"'.format(
+        name, output)
+    return response
@@ -0,0 +1,16 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from gitos.clients import get_rehive
+from gitos.webhooks import backfill_pull_request_transactions
+
+
+class Command(BaseCommand):
+    help = 'Store the Rehive transactions of existing pull requests locally.'
+
+    def handle(self, *args, **options):
+        rehive = get_rehive(os.environ.get('REHIVE_AUTH_TOKEN'))
+        created = backfill_pull_request_transactions(rehive)
+        self.stdout.write('Created {} pull request transactions.'.format(
+            created))
@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from gitos.enums import GithubIssueBountyStatus
+from gitos.models import Currency, GithubIssueBounty
+
+
+def get_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN ' + sql, params)
+        return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+class Command(BaseCommand):
+    help = 'Check that hot lookups are planned as index scans.'
+
+    def get_queries(self):
+        """
+        Return (description, queryset, index name) tuples. When the index name
+        is `None` any index is accepted.
+        """
+        now = timezone.now()
+
+        return (
+            ('bounty by url',
+             GithubIssueBounty.objects.filter(url='https://github.com/'),
+             None),
+            ('bounty by issue_nr',
+             GithubIssueBounty.objects.filter(issue_nr=1),
+             None),
+            ('open bounty by issue_nr',
+             GithubIssueBounty.objects.filter(issue_nr=1,
+                status=GithubIssueBountyStatus.OPEN,
+                url__endswith='/octo/gitos/issues/1'
+             ).order_by('-created', '-id')[:1],
+             'gitos_githubissuebounty_open_issue_nr'),
+            ('bounty keyset page',
+             GithubIssueBounty.objects.filter(
+                Q(created__lt=now) | Q(created=now, id__lt=1)
+             ).order_by('-created', '-id')[:11],
+             None),
+            ('currency by company and code',
+             Currency.objects.filter(company_id=1, code__iexact='usd'),
+             'gitos_currency_company_upper_code_uniq'),
+            ('currency keyset page',
+             Currency.objects.filter(company_id=1).filter(
+                Q(created__lt=now) | Q(created=now, id__lt=1)
+             ).order_by('-created', '-id')[:11],
+             None),
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+
+        with transaction.atomic():
+            # Small tables are always cheaper to scan, so discourage
+            # sequential scans to see which indexes the planner can use.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for description, queryset, index in self.get_queries():
+                plan = get_plan(queryset)
+                if 'Seq Scan' in plan or (index and index not in plan):
+                    failures.append('{}:\n{}'.format(description, plan))
+                else:
+                    self.stdout.write('OK {}'.format(description))
+
+        if failures:
+            raise CommandError('Unexpected query plans.\n\n{}'.format(
+                '\n\n'.join(failures)))
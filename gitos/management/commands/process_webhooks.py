@@ -0,0 +1,61 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from gitos.webhooks import process_jobs
+
+
+class Command(BaseCommand):
+    help = 'Process queued GitHub webhook jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1,
+            help='Number of worker processes to run.')
+        parser.add_argument('--batch-size', type=int, default=10,
+            help='Number of jobs claimed per poll.')
+        parser.add_argument('--interval', type=float, default=1.0,
+            help='Seconds to wait before polling an empty queue again.')
+        parser.add_argument('--once', action='store_true', default=False,
+            help='Exit once the queue is empty.')
+
+    def handle(self, *args, **options):
+        if options['processes'] <= 1:
+            return self.work(options)
+
+        # Each process has to open its own database connection.
+        connections.close_all()
+
+        workers = [
+            multiprocessing.Process(target=self.work, args=(options,))
+            for i in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+
+    def work(self, options):
+        self.running = True
+
+        def stop(signum, frame):
+            self.running = False
+
+        signal.signal(signal.SIGTERM, stop)
+
+        while self.running:
+            # Drop connections that broke or outlived CONN_MAX_AGE, as the
+            # request cycle would.
+            close_old_connections()
+            if process_jobs(options['batch_size']):
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
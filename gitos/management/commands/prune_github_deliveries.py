@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from gitos.webhooks import prune_deliveries
+
+
+class Command(BaseCommand):
+    help = 'Delete old GitHub webhook delivery records.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+            default=settings.GITHUB_DELIVERY_RETENTION_DAYS,
+            help='Delete deliveries older than this many days.')
+
+    def handle(self, *args, **options):
+        deleted = prune_deliveries(options['days'])
+        self.stdout.write('Deleted {} deliveries.'.format(deleted))
@@ -0,0 +1,69 @@
+import time
+
+from datetime import timedelta
+from logging import getLogger
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from config.exceptions import ServiceUnavailable
+from gitos.currencies import sync_company_currencies
+from gitos.models import Company
+
+logger = getLogger('django')
+
+
+class Command(BaseCommand):
+    help = 'Sync company currencies from Rehive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', action='append', default=[],
+            help='Only sync the company with this identifier.')
+        parser.add_argument('--min-age', type=int, default=0,
+            help='Skip companies synced less than this many seconds ago.')
+        parser.add_argument('--interval', type=int, default=None,
+            help='Keep running, syncing every this many seconds.')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            self.sync(options)
+            if options['interval'] is None:
+                break
+            time.sleep(options['interval'])
+
+    def sync(self, options):
+        companies = Company.objects.select_related('admin')
+
+        if options['company']:
+            companies = companies.filter(identifier__in=options['company'])
+
+        if options['min_age']:
+            cutoff = timezone.now() - timedelta(seconds=options['min_age'])
+            companies = companies.filter(
+                Q(currencies_synced__isnull=True) |
+                Q(currencies_synced__lt=cutoff))
+
+        for company in companies.iterator():
+            try:
+                result = sync_company_currencies(company)
+            except ServiceUnavailable as exc:
+                # The circuit breaker is open, wait for the next pass.
+                self.stderr.write('Rehive unavailable, retry in {}s'.format(
+                    exc.wait))
+                break
+            except Exception as exc:
+                # Rehive and database errors of one company must not stop
+                # the sync of the others.
+                logger.exception(exc)
+                self.stderr.write('{}: failed ({})'.format(company, exc))
+                continue
+
+            if result is None:
+                self.stdout.write('{}: unchanged'.format(company))
+            else:
+                self.stdout.write(
+                    '{}: {} created, {} updated, {} disabled'.format(
+                        company, *result))
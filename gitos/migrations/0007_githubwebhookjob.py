@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.7 on 2026-10-18 09:12
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.utils.timezone
+import enumfields.fields
+import gitos.enums
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gitos', '0006_githubissuebounty_issue_nr'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GithubWebhookJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('payload', django.contrib.postgres.fields.jsonb.JSONField()),
+                ('status', enumfields.fields.EnumField(default='pending', enum=gitos.enums.WebhookJobStatus, max_length=50)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('error', models.TextField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='githubwebhookjob',
+            index_together=set([('status', 'next_attempt')]),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.7 on 2026-10-18 10:03
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gitos', '0007_githubwebhookjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GithubDelivery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('delivery_id', models.CharField(max_length=64, null=True, unique=True)),
+                ('pr_id', models.BigIntegerField()),
+                ('action', models.CharField(max_length=50)),
+                ('result', django.contrib.postgres.fields.jsonb.JSONField(null=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='githubdelivery',
+            unique_together=set([('pr_id', 'action')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='githubdelivery',
+            index_together=set([('created',)]),
+        ),
+    ]
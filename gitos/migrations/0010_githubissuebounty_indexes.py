@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.7 on 2026-10-18 11:20
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gitos', '0009_pullrequesttransaction'),
+    ]
+
+    operations = [
+        # Keep only the newest bounty per issue url before enforcing
+        # uniqueness, moving the others to
+        # `gitos_githubissuebounty_duplicates`. Reversing restores them.
+        migrations.RunSQL(
+            """
+            CREATE TABLE gitos_githubissuebounty_duplicates AS
+            SELECT a.* FROM gitos_githubissuebounty a
+            WHERE EXISTS (
+                SELECT 1 FROM gitos_githubissuebounty b
+                WHERE b.url = a.url AND b.id > a.id
+            );
+            DELETE FROM gitos_githubissuebounty
+            WHERE id IN (SELECT id FROM gitos_githubissuebounty_duplicates);
+            """,
+            """
+            INSERT INTO gitos_githubissuebounty
+            SELECT * FROM gitos_githubissuebounty_duplicates;
+            DROP TABLE gitos_githubissuebounty_duplicates;
+            """,
+        ),
+        migrations.AlterField(
+            model_name='githubissuebounty',
+            name='issue_nr',
+            field=models.IntegerField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='githubissuebounty',
+            name='url',
+            field=models.URLField(unique=True),
+        ),
+        migrations.RunSQL(
+            """
+            CREATE INDEX gitos_githubissuebounty_open_issue_nr
+            ON gitos_githubissuebounty (issue_nr)
+            WHERE status = 'open';
+            """,
+            "DROP INDEX gitos_githubissuebounty_open_issue_nr;",
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.7 on 2026-10-18 11:58
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gitos', '0010_githubissuebounty_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='githubissuebounty',
+            index_together=set([('created', 'id')]),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.7 on 2026-10-18 12:34
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gitos', '0011_githubissuebounty_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='currency',
+            index_together=set([('company', 'created', 'id')]),
+        ),
+    ]
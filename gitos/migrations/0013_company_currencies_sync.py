@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.7 on 2026-10-18 13:47
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gitos', '0012_currency_company_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='currencies_digest',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='currencies_synced',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.7 on 2026-10-18 14:22
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gitos', '0013_company_currencies_sync'),
+    ]
+
+    operations = [
+        # Codes were only unique per company case sensitively. Keep the most
+        # recently updated currency of each case insensitive code, moving the
+        # others to `gitos_currency_duplicates`. Reversing restores them.
+        migrations.RunSQL(
+            """
+            CREATE TABLE gitos_currency_duplicates AS
+            SELECT a.* FROM gitos_currency a
+            WHERE EXISTS (
+                SELECT 1 FROM gitos_currency b
+                WHERE b.company_id = a.company_id
+                AND UPPER(b.code::text) = UPPER(a.code::text)
+                AND (b.updated, b.id) > (a.updated, a.id)
+            );
+            DELETE FROM gitos_currency
+            WHERE id IN (SELECT id FROM gitos_currency_duplicates);
+            """,
+            """
+            INSERT INTO gitos_currency
+            SELECT * FROM gitos_currency_duplicates;
+            DROP TABLE gitos_currency_duplicates;
+            """,
+        ),
+        # Matches the expression Django generates for `code__iexact` lookups.
+        migrations.RunSQL(
+            """
+            CREATE UNIQUE INDEX gitos_currency_company_upper_code_uniq
+            ON gitos_currency (company_id, UPPER(code::text));
+            """,
+            "DROP INDEX gitos_currency_company_upper_code_uniq;",
+        ),
+    ]
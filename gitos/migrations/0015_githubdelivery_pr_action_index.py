@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.7 on 2026-10-18 15:40
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gitos', '0014_currency_company_upper_code_uniq'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='githubdelivery',
+            unique_together=set([]),
+        ),
+        migrations.AlterIndexTogether(
+            name='githubdelivery',
+            index_together=set([('pr_id', 'action'), ('created',)]),
+        ),
+    ]
@@ -1,9 +1,12 @@
 import uuid
 
 from enumfields import EnumField
+from django.contrib.postgres.fields import JSONField
 from django.db import models
+from django.utils import timezone
+from gitos.cache import invalidate_tags
 from gitos.fields import MoneyField
-from gitos.enums import GithubIssueBountyStatus
+from gitos.enums import GithubIssueBountyStatus, WebhookJobStatus
 
 
 class DateModel(models.Model):
@@ -23,6 +26,9 @@ class Company(DateModel):
         related_name='admin_company')
     secret = models.UUIDField()
     name = models.CharField(max_length=100, null=True, blank=True)
+    # Watermark of the last currency sync with Rehive.
+    currencies_digest = models.CharField(max_length=64, null=True, blank=True)
+    currencies_synced = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return self.identifier
@@ -56,16 +62,22 @@ class Currency(DateModel):
     divisibility = models.IntegerField(default=2)
     enabled = models.BooleanField(default=True)
 
+    class Meta:
+        index_together = (('company', 'created', 'id'),)
+
     def __str__(self):
         return str(self.code)
 
 
 class GithubIssueBounty(DateModel):
-    issue_nr = models.IntegerField()
-    url = models.URLField()
+    issue_nr = models.IntegerField(db_index=True)
+    url = models.URLField(unique=True)
     amount = MoneyField()
     status = EnumField(GithubIssueBountyStatus, max_length=50)
 
+    class Meta:
+        index_together = (('created', 'id'),)
+
     @classmethod
     def close(cls, issue_url: str) -> bool:
         try:
@@ -73,4 +85,53 @@ class GithubIssueBounty(DateModel):
         except cls.DoesNotExist:
             return False
         else:
-            return bty.delete()
+            deleted = bty.delete()
+            invalidate_tags('bounties')
+            return deleted
+
+
+class GithubWebhookJob(DateModel):
+    """
+    Queued GitHub pull request event, processed by the `process_webhooks`
+    management command.
+    """
+    payload = JSONField()
+    status = EnumField(WebhookJobStatus, max_length=50,
+        default=WebhookJobStatus.PENDING)
+    attempts = models.IntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        index_together = (('status', 'next_attempt'),)
+
+    def __str__(self):
+        return str(self.id)
+
+
+class GithubDelivery(DateModel):
+    """
+    Received GitHub webhook delivery, used to answer redeliveries of an event
+    without processing it again.
+    """
+    delivery_id = models.CharField(max_length=64, unique=True, null=True)
+    pr_id = models.BigIntegerField()
+    action = models.CharField(max_length=50)
+    result = JSONField(null=True)
+
+    class Meta:
+        index_together = (('created',), ('pr_id', 'action'))
+
+    def __str__(self):
+        return str(self.delivery_id)
+
+
+class PullRequestTransaction(DateModel):
+    """
+    Rehive transaction credited for a GitHub pull request.
+    """
+    pr_id = models.BigIntegerField(unique=True)
+    tx_id = models.CharField(max_length=64)
+
+    def __str__(self):
+        return str(self.pr_id)
@@ -1,7 +1,40 @@
+import binascii
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from collections import OrderedDict
 
-from rest_framework.pagination import PageNumberPagination
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_text
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination, PageNumberPagination, _positive_int
+)
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate for a queryset. Unfiltered querysets
+    use the table statistics in `pg_class.reltuples`.
+    """
+    connection = connections[queryset.db]
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+            # reltuples is negative for tables that were never analyzed.
+            return max(row[0], 0) if row else 0
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        return cursor.fetchone()[0][0]['Plan']['Plan Rows']
 
 
 class ResultsSetPagination(PageNumberPagination):
@@ -21,3 +54,111 @@ class ResultsSetPagination(PageNumberPagination):
             ('status', 'success'),
             ('data', response)
         ]))
+
+
+class CursorResultsSetPagination(BasePagination):
+    """
+    Keyset pagination on (created, id), newest first.
+
+    Cursors are opaque and encode the position of the last row of a page, so
+    every page is a single index range scan no matter how deep a client walks.
+
+    No total is returned unless the client asks for one with `?count=exact`
+    (a COUNT query) or `?count=estimate` (the planner's row estimate).
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 250
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-created', '-id')
+    invalid_cursor_message = _('Invalid cursor.')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        count = request.query_params.get(self.count_query_param)
+        if count == 'exact':
+            self.count = queryset.count()
+        elif count == 'estimate':
+            self.count = estimate_count(queryset)
+        else:
+            self.count = None
+
+        position = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            created, pk = position
+            queryset = queryset.filter(
+                Q(created__lt=created) | Q(created=created, id__lt=pk))
+
+        # Fetch one extra row to know whether there is a next page.
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            created, pk = force_text(
+                urlsafe_b64decode(encoded.encode('ascii'))).split('|')
+            created = parse_datetime(created)
+            pk = int(pk)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return created, pk
+
+    def get_position(self, row):
+        """
+        Return the (created, id) position of a row. Rows fetched with
+        `.values_list()` must start with these two columns.
+        """
+        if isinstance(row, tuple):
+            return row[0], row[1]
+        return row.created, row.id
+
+    def encode_cursor(self, row):
+        created, pk = self.get_position(row)
+        position = '{}|{}'.format(created.isoformat(), pk)
+        return force_text(urlsafe_b64encode(position.encode('ascii')))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param,
+            self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data)
+        ])
+        if self.count is not None:
+            response['count'] = self.count
+            response.move_to_end('count', last=False)
+
+        return Response(OrderedDict([
+            ('status', 'success'),
+            ('data', response)
+        ]))
@@ -0,0 +1,21 @@
+import msgpack
+import six
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from gitos.renderers import decode_ext
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses MessagePack-serialized data.
+    """
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), encoding='utf-8',
+                ext_hook=decode_ext)
+        except Exception as exc:
+            raise ParseError(
+                'MessagePack parse error - %s' % six.text_type(exc))
@@ -0,0 +1,48 @@
+import decimal
+import uuid
+
+import msgpack
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# MessagePack extension type codes.
+DECIMAL_EXT = 1
+UUID_EXT = 2
+
+
+def encode_ext(obj):
+    """
+    Encode values MessagePack has no native type for. Decimals and UUIDs
+    become extension types so that they round-trip exactly, everything else
+    is encoded the same way as in JSON responses.
+    """
+    if isinstance(obj, decimal.Decimal):
+        return msgpack.ExtType(DECIMAL_EXT, str(obj).encode('ascii'))
+    elif isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(UUID_EXT, obj.bytes)
+    return JSONEncoder().default(obj)
+
+
+def decode_ext(code, data):
+    if code == DECIMAL_EXT:
+        return decimal.Decimal(data.decode('ascii'))
+    elif code == UUID_EXT:
+        return uuid.UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return bytes()
+
+        return msgpack.packb(data, default=encode_ext, use_bin_type=True)
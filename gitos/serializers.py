@@ -1,11 +1,19 @@
 import uuid
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
-from rehive import Rehive, APIException
+from rehive import APIException
 from rest_framework import serializers
 from django.db import transaction
+from django.utils import timezone
 
+from config.metrics import remote_wait
+from gitos.authentication import invalidate_company_tokens
+from gitos.cache import invalidate_tags
+from gitos.clients import get_rehive
+from gitos.currencies import get_digest, invalidate_company_currencies
 from gitos.models import Company, User, Currency, GithubIssueBounty
 from gitos.enums import GithubIssueBountyStatus
 
@@ -25,7 +33,7 @@ class ActivateSerializer(serializers.Serializer):
     secret = serializers.UUIDField(read_only=True)
 
     def validate(self, validated_data):
-        rehive = Rehive(validated_data.get('token'))
+        rehive = get_rehive(validated_data.get('token'))
 
         try:
             user = rehive.user.get()
@@ -36,8 +44,14 @@ class ActivateSerializer(serializers.Serializer):
         except APIException:
             raise serializers.ValidationError({"token": ["Invalid user."]})
 
+        # Fetch the company and its currencies concurrently. The calls run in
+        # other threads, so the request's Rehive time is the time waited here.
+        with remote_wait(), ThreadPoolExecutor(max_workers=2) as executor:
+            company_future = executor.submit(rehive.admin.company.get)
+            currencies_future = executor.submit(rehive.company.currencies.get)
+
         try:
-            company = rehive.admin.company.get()
+            company = company_future.result()
         except APIException:
             raise serializers.ValidationError({"token": ["Invalid company."]})
 
@@ -46,7 +60,7 @@ class ActivateSerializer(serializers.Serializer):
                 {"token": ["Company already activated."]})
 
         try:
-            currencies = rehive.company.currencies.get()
+            currencies = currencies_future.result()
         except APIException:
             raise serializers.ValidationError({"non_field_errors":
                 ["Unkown error."]})
@@ -69,24 +83,27 @@ class ActivateSerializer(serializers.Serializer):
 
             company = Company.objects.create(admin=user,
                 identifier=rehive_company.get('identifier'),
-                name=rehive_company.get('name'))
+                name=rehive_company.get('name'),
+                currencies_digest=get_digest(currencies),
+                currencies_synced=timezone.now())
 
             user.company = company
             user.save()
 
             # Add currencies to company automatically.
-            for kwargs in currencies:
-                kwargs['company'] = company
-                currency = Currency.objects.create(**kwargs)
+            Currency.objects.bulk_create(
+                [Currency(company=company, **kwargs) for kwargs in currencies])
+
+        invalidate_company_currencies(company)
 
-            return company
+        return company
 
 
 class DeactivateSerializer(serializers.Serializer):
     token = serializers.CharField(write_only=True)
 
     def validate(self, validated_data):
-        rehive = Rehive(validated_data.get('token'))
+        rehive = get_rehive(validated_data.get('token'))
 
         try:
             user = rehive.user.get()
@@ -107,8 +124,11 @@ class DeactivateSerializer(serializers.Serializer):
         return validated_data
 
     def delete(self):
+        company = self.validated_data['company']
         # Cascade delete to rmeove the company and other children entities.
-        self.validated_data['company'].admin.delete()
+        company.admin.delete()
+        invalidate_company_tokens(company.identifier)
+        invalidate_company_currencies(company)
 
 
 class AdminCompanySerializer(serializers.ModelSerializer):
@@ -155,3 +175,51 @@ class CreateGithubBountiesSerializer(serializers.ModelSerializer):
     def validate(self, validated_data):
         validated_data['status'] = GithubIssueBountyStatus(validated_data.get('status'))
         return validated_data
+
+    def create(self, validated_data):
+        bounty = super(CreateGithubBountiesSerializer, self).create(
+            validated_data)
+        invalidate_tags('bounties')
+        return bounty
+
+
+class RowSerializer(object):
+    """
+    Read-only serializer for rows fetched with `.values_list()`.
+
+    `fields` is a sequence of (name, column, to_representation) tuples,
+    `to_representation` is applied to non-null values and may be `None`.
+    Unlike DRF serializers no field instances are created per row.
+    """
+    fields = ()
+
+    def __init__(self):
+        self.names = tuple(f[0] for f in self.fields)
+        self.columns = tuple(f[1] for f in self.fields)
+        self.converters = tuple(f[2] for f in self.fields)
+
+    def to_representation(self, row):
+        return OrderedDict(
+            (name, value if convert is None or value is None else convert(value))
+            for name, convert, value in zip(self.names, self.converters, row)
+        )
+
+
+class CurrencyRowSerializer(RowSerializer):
+    fields = (
+        ('code', 'code', None),
+        ('description', 'description', None),
+        ('symbol', 'symbol', None),
+        ('unit', 'unit', None),
+        ('divisibility', 'divisibility', None),
+        ('enabled', 'enabled', None),
+    )
+
+
+class GithubBountiesRowSerializer(RowSerializer):
+    fields = (
+        ('issue_nr', 'issue_nr', None),
+        ('url', 'url', None),
+        ('amount', 'amount', lambda amount: to_cents(Decimal(str(amount)), 0)),
+        ('status', 'status', lambda status: getattr(status, 'value', status)),
+    )
@@ -0,0 +1,231 @@
+import csv
+import json
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from gitos.cache import get_tag_versions
+from gitos.enums import GithubIssueBountyStatus
+from gitos.exports import iterate_rows
+from gitos.models import GithubIssueBounty
+
+
+def create_bounty(issue_nr, status=GithubIssueBountyStatus.OPEN):
+    return GithubIssueBounty.objects.create(
+        issue_nr=issue_nr,
+        url='https://api.github.com/repos/octo/gitos/issues/{}'.format(
+            issue_nr),
+        amount=100,
+        status=status
+    )
+
+
+class BountyListPaginationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def walk(self, url):
+        """
+        Follow the `next` links from `url` and return every row.
+        """
+        rows = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()['data']
+            rows.extend(data['results'])
+            url = data['next']
+        return rows
+
+    def test_walk_with_tied_created(self):
+        bounties = [create_bounty(i) for i in range(1, 26)]
+
+        # Rows sharing a `created` value straddle page boundaries.
+        now = timezone.now()
+        GithubIssueBounty.objects.filter(issue_nr__lte=12).update(
+            created=now - timedelta(minutes=1))
+        GithubIssueBounty.objects.filter(issue_nr__gt=12).update(created=now)
+
+        rows = self.walk('/api/github/bounties/?page_size=4')
+
+        # Newest first, ties broken by id.
+        expected = sorted(bounties, key=lambda b: b.issue_nr > 12)
+        expected = [b.url for b in reversed(expected)]
+        self.assertEqual([row['url'] for row in rows], expected)
+
+    def test_walk_with_filter(self):
+        for i in range(1, 8):
+            create_bounty(i, GithubIssueBountyStatus.OPEN if i % 2
+                else GithubIssueBountyStatus.CLOSED)
+        GithubIssueBounty.objects.update(created=timezone.now())
+
+        rows = self.walk('/api/github/bounties/?page_size=2&status=open')
+
+        self.assertEqual([row['issue_nr'] for row in rows], [7, 5, 3, 1])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/github/bounties/?cursor=invalid')
+        self.assertEqual(response.status_code, 404)
+
+
+class BountyExportTests(TestCase):
+
+    def setUp(self):
+        for i in range(1, 6):
+            create_bounty(i)
+
+    def get_content(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson(self):
+        response = self.client.get('/api/github/bounties/export/')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        rows = [json.loads(line)
+            for line in self.get_content(response).splitlines()]
+        self.assertEqual([row['issue_nr'] for row in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(rows[0], {
+            'issue_nr': 1,
+            'url': 'https://api.github.com/repos/octo/gitos/issues/1',
+            'amount': 100,
+            'status': 'open',
+        })
+
+    def test_csv(self):
+        response = self.client.get('/api/github/bounties/export/?format=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('bounties.csv', response['Content-Disposition'])
+
+        rows = list(csv.reader(self.get_content(response).splitlines()))
+        self.assertEqual(rows[0], ['issue_nr', 'url', 'amount', 'status'])
+        self.assertEqual([row[0] for row in rows[1:]],
+            ['1', '2', '3', '4', '5'])
+
+    def test_invalid_format(self):
+        response = self.client.get('/api/github/bounties/export/?format=xml')
+        self.assertEqual(response.status_code, 400)
+
+    def test_iterate_rows_in_chunks(self):
+        rows = list(iterate_rows(GithubIssueBounty.objects.all(),
+            ('issue_nr',), chunk_size=2))
+        self.assertEqual(rows, [(1,), (2,), (3,), (4,), (5,)])
+
+
+@override_settings(RESPONSE_CACHE_TTLS={'root': 0, 'bounties': 0, 'bounty': 0})
+class BountyConditionalTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.bounty = create_bounty(1)
+        self.url = '/api/github/bounties/{}/'.format(self.bounty.id)
+
+    def test_if_none_match(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_changed_bounty(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        self.bounty.status = GithubIssueBountyStatus.CLOSED
+        self.bounty.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['data']['status'], 'closed')
+
+    def test_if_modified_since(self):
+        response = self.client.get(self.url)
+        last_modified = response['Last-Modified']
+
+        response = self.client.get(self.url,
+            HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_has_no_last_modified(self):
+        response = self.client.get('/api/github/bounties/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+
+        response = self.client.get('/api/github/bounties/',
+            HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class BountyCacheTagTests(TransactionTestCase):
+    """
+    Tags are bumped by `transaction.on_commit`, which needs real commits.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def get_version(self):
+        return get_tag_versions(('bounties',))[0]
+
+    def test_create_bumps_tag(self):
+        version = self.get_version()
+
+        response = self.client.post('/api/github/bounties/', {
+            'issue_nr': 1,
+            'url': 'https://api.github.com/repos/octo/gitos/issues/1',
+            'amount': 100,
+            'status': 'open',
+        })
+        self.assertEqual(response.status_code, 201)
+
+        self.assertNotEqual(self.get_version(), version)
+
+    def test_close_bumps_tag_after_commit(self):
+        bounty = create_bounty(1)
+        version = self.get_version()
+
+        with transaction.atomic():
+            self.assertTrue(GithubIssueBounty.close(bounty.url))
+            self.assertEqual(self.get_version(), version)
+
+        self.assertNotEqual(self.get_version(), version)
+
+    def test_rollback_keeps_tag(self):
+        bounty = create_bounty(1)
+        version = self.get_version()
+
+        try:
+            with transaction.atomic():
+                GithubIssueBounty.close(bounty.url)
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertEqual(self.get_version(), version)
+        self.assertTrue(
+            GithubIssueBounty.objects.filter(id=bounty.id).exists())
+
+    def test_cached_list_is_invalidated(self):
+        create_bounty(1)
+        response = self.client.get('/api/github/bounties/')
+        self.assertEqual(len(response.json()['data']['results']), 1)
+
+        bounty = create_bounty(2)
+        # Not invalidated, the cached response is served.
+        response = self.client.get('/api/github/bounties/')
+        self.assertEqual(len(response.json()['data']['results']), 1)
+
+        GithubIssueBounty.close(bounty.url)
+        GithubIssueBounty.close(
+            'https://api.github.com/repos/octo/gitos/issues/1')
+        response = self.client.get('/api/github/bounties/')
+        self.assertEqual(response.json()['data']['results'], [])
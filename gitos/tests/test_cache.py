@@ -0,0 +1,22 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test.client import RequestFactory
+
+from gitos.cache import get_tag_versions
+
+
+class TagVersionTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/api/github/bounties/')
+
+    def test_versions_are_read_once_per_request(self):
+        versions = get_tag_versions(('bounties',), self.request)
+
+        with mock.patch.object(cache, 'get_many') as get_many:
+            self.assertEqual(
+                get_tag_versions(('bounties',), self.request), versions)
+        get_many.assert_not_called()
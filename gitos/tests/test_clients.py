@@ -0,0 +1,178 @@
+import importlib
+
+from unittest import mock
+
+import requests
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from rehive import APIException
+
+from config.exceptions import ServiceUnavailable, custom_exception_handler
+from config.metrics import finish_request, remote_wait, start_request
+from gitos.breaker import CircuitBreaker
+from gitos.clients import Client, Rehive, get_endpoint, get_rehive
+
+
+class ImportTests(SimpleTestCase):
+
+    def test_modules_import(self):
+        """
+        Every module importing the Rehive SDK loads with the pinned version.
+        """
+        for name in ('gitos.authentication', 'gitos.clients',
+                     'gitos.currencies', 'gitos.serializers', 'gitos.views',
+                     'gitos.webhooks', 'config.wsgi'):
+            importlib.import_module(name)
+
+
+class ClientTests(SimpleTestCase):
+
+    def test_get_rehive(self):
+        rehive = get_rehive('token')
+        self.assertIsInstance(rehive, Rehive)
+        self.assertIsInstance(rehive.client, Client)
+        self.assertEqual(rehive.client.endpoint, settings.REHIVE_API_URL)
+        self.assertIs(rehive.admin.transactions.client, rehive.client)
+
+    def test_get_endpoint(self):
+        self.assertEqual(get_endpoint('user/'), 'user/')
+        self.assertEqual(
+            get_endpoint('admin/users/5b2e7c1a-0e1f-4d6a-9c3b/'),
+            'admin/users/{id}/')
+        self.assertEqual(
+            get_endpoint('admin/transactions/?reference=123'),
+            'admin/transactions/')
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    """
+    Transport answering every request with an empty Rehive response.
+    """
+    content = b'{"status": "success", "data": {}}'
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.content
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class ClientMetricsTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch('gitos.clients.breaker', CircuitBreaker())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch('gitos.clients.record_remote_call')
+    def test_payload_sizes_are_recorded(self, record_remote_call):
+        session = requests.Session()
+        session.mount('https://', FakeAdapter())
+        client = Client('token')
+        client._session = session
+
+        client._request('POST', 'admin/users/', data={'email': 'a@b.c'})
+
+        endpoint, method, outcome, duration, sent, received = \
+            record_remote_call.call_args[0]
+        self.assertEqual((endpoint, method, outcome),
+            ('admin/users/', 'POST', 'success'))
+        self.assertEqual(sent, len(b'{"email": "a@b.c"}'))
+        self.assertEqual(received, len(FakeAdapter.content))
+
+    @mock.patch('config.metrics.time.perf_counter', side_effect=[1.0, 1.5])
+    def test_remote_wait_adds_to_request(self, perf_counter):
+        start_request()
+        with remote_wait():
+            pass
+        queries, remote_time = finish_request()
+        self.assertEqual(remote_time, 0.5)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(threshold=3, reset_timeout=30)
+
+        for i in range(2):
+            breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.retry_after(), 30)
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+@override_settings(REHIVE_RETRIES=2)
+@mock.patch('gitos.clients.time.sleep')
+class ClientRetryTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch('gitos.clients.breaker',
+            CircuitBreaker(threshold=100, reset_timeout=30))
+        self.breaker = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = Client('token')
+
+    def request(self, method, error):
+        with mock.patch('rehive.api.client.Client._request',
+                side_effect=error) as request:
+            with self.assertRaises(APIException):
+                self.client._request(method, 'user/')
+        return request.call_count
+
+    def test_get_is_retried(self, sleep):
+        self.assertEqual(self.request('GET', APIException('Error', 503)), 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_network_error_is_retried(self, sleep):
+        self.assertEqual(self.request('GET', APIException('Error')), 3)
+
+    def test_post_is_not_retried(self, sleep):
+        self.assertEqual(self.request('POST', APIException('Error', 503)), 1)
+        sleep.assert_not_called()
+
+    def test_client_error_is_not_retried(self, sleep):
+        self.assertEqual(self.request('GET', APIException('Error', 400)), 1)
+
+    def test_open_breaker_rejects_calls(self, sleep):
+        for i in range(self.breaker.threshold):
+            self.breaker.record_failure()
+
+        with mock.patch('rehive.api.client.Client._request') as request:
+            with self.assertRaises(ServiceUnavailable) as context:
+                self.client._request('GET', 'user/')
+        request.assert_not_called()
+        self.assertEqual(context.exception.wait, 30)
+
+        response = custom_exception_handler(context.exception, {})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '30')
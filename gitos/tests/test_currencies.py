@@ -0,0 +1,63 @@
+import uuid
+
+from unittest import mock
+
+from django.test import TestCase
+
+from gitos.currencies import (
+    currency_cache, get_company_currencies, sync_company_currencies
+)
+from gitos.models import Company, Currency, User
+
+
+class CompanyCurrenciesTests(TestCase):
+
+    def setUp(self):
+        currency_cache.clear()
+        admin = User.objects.create(identifier=uuid.uuid4())
+        self.company = Company.objects.create(identifier='test', admin=admin,
+            secret=uuid.uuid4(), currencies_digest='a')
+        Currency.objects.create(company=self.company, code='XBT',
+            description='Bitcoin')
+
+    def test_cache_follows_digest(self):
+        """
+        A sync made by another process, which cannot invalidate this
+        process's cache, is seen once the company digest changes.
+        """
+        currencies = get_company_currencies(self.company)
+        self.assertEqual(currencies['XBT']['description'], 'Bitcoin')
+
+        Currency.objects.filter(company=self.company).update(
+            description='Bitcoin Core')
+        company = Company.objects.get(pk=self.company.pk)
+        self.assertEqual(
+            get_company_currencies(company)['XBT']['description'], 'Bitcoin')
+
+        Company.objects.filter(pk=company.pk).update(currencies_digest='b')
+        company = Company.objects.get(pk=company.pk)
+        self.assertEqual(get_company_currencies(company)['XBT']['description'],
+            'Bitcoin Core')
+
+
+class SyncCompanyCurrenciesTests(TestCase):
+
+    def setUp(self):
+        admin = User.objects.create(identifier=uuid.uuid4())
+        self.company = Company.objects.create(identifier='test', admin=admin,
+            secret=uuid.uuid4())
+        Currency.objects.create(company=self.company, code='xbt',
+            description='Bitcoin')
+
+    def sync(self, *currencies):
+        rehive = mock.Mock()
+        rehive.company.currencies.get.return_value = list(currencies)
+        rehive.company.currencies.next = None
+        return sync_company_currencies(self.company, rehive=rehive)
+
+    def test_code_case_change_updates_row(self):
+        result = self.sync({'code': 'XBT', 'description': 'Bitcoin'})
+
+        self.assertEqual(result, (0, 1, 0))
+        self.assertEqual(
+            list(Currency.objects.values_list('code', flat=True)), ['XBT'])
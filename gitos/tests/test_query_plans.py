@@ -0,0 +1,13 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+
+class QueryPlanTests(TestCase):
+
+    def test_hot_lookups_use_indexes(self):
+        try:
+            call_command('check_query_plans', stdout=StringIO())
+        except CommandError as exc:
+            self.fail(str(exc))
@@ -0,0 +1,216 @@
+import json
+
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from gitos.enums import GithubIssueBountyStatus, WebhookJobStatus
+from gitos.models import GithubDelivery, GithubIssueBounty, GithubWebhookJob
+from gitos.webhooks import (
+    claim_jobs, enqueue_pull_request, get_repository, process_jobs,
+    process_pull_request
+)
+
+
+PAYLOAD = {
+    'pr_id': 1,
+    'action': 'closed',
+    'merged': True,
+    'username': 'octocat',
+    'issue_url': 'https://api.github.com/repos/octo/gitos/issues/1',
+    'body': '',
+}
+
+
+def get_event(action='closed', pr_id=1):
+    return {
+        'action': action,
+        'pull_request': {
+            'id': pr_id,
+            'merged': False,
+            'user': {'login': 'octocat'},
+            'issue_url': 'https://api.github.com/repos/octo/gitos/issues/1',
+            'body': '',
+        },
+    }
+
+
+class GithubViewTests(TestCase):
+
+    def post(self, data, delivery_id):
+        return self.client.post('/api/github/', data,
+            content_type='application/json',
+            HTTP_X_GITHUB_DELIVERY=delivery_id)
+
+    def test_redelivery_is_not_queued(self):
+        data = json.dumps(get_event())
+
+        response = self.post(data, 'delivery-1')
+        self.assertEqual(response.status_code, 202)
+
+        response = self.post(data, 'delivery-1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(GithubWebhookJob.objects.count(), 1)
+        job = GithubWebhookJob.objects.get()
+        self.assertEqual(response.json()['data'], {'job': job.id})
+
+    def test_new_delivery_is_queued(self):
+        # A pull request closed, reopened and closed again.
+        for delivery_id in ('delivery-1', 'delivery-2', 'delivery-3'):
+            action = 'opened' if delivery_id == 'delivery-2' else 'closed'
+            response = self.post(json.dumps(get_event(action)), delivery_id)
+            self.assertEqual(response.status_code, 202)
+
+        self.assertEqual(GithubWebhookJob.objects.count(), 3)
+
+
+class EnqueuePullRequestTests(TestCase):
+
+    def test_event_without_delivery_id(self):
+        delivery, created = enqueue_pull_request(get_event())
+        self.assertTrue(created)
+
+        self.assertEqual(enqueue_pull_request(get_event()), (delivery, False))
+        self.assertEqual(GithubWebhookJob.objects.count(), 1)
+
+        # Outside of the window the event is processed again.
+        GithubDelivery.objects.filter(id=delivery.id).update(
+            created=timezone.now() - timedelta(hours=1))
+        self.assertTrue(enqueue_pull_request(get_event())[1])
+        self.assertEqual(GithubWebhookJob.objects.count(), 2)
+
+    def test_ignored_events(self):
+        self.assertEqual(enqueue_pull_request(get_event('edited')),
+            (None, False))
+        self.assertEqual(enqueue_pull_request({'action': 'closed'}),
+            (None, False))
+
+
+class ProcessPullRequestTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('gitos.webhooks.get_rehive')
+        self.rehive = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.rehive.admin.users.create.return_value = {
+            'identifier': '3f8c2a9e-7c4b-4d1e-9a6f-0b5d2e8c1a7f'}
+        self.rehive.admin.transactions.create_credit.return_value = {
+            'id': 'tx'}
+
+    def create_bounty(self, url, amount):
+        return GithubIssueBounty.objects.create(issue_nr=5, url=url,
+            amount=amount, status=GithubIssueBountyStatus.OPEN)
+
+    def get_credited_amount(self):
+        process_pull_request(dict(PAYLOAD, pr_id=2, action='opened',
+            body='Fixes #5'))
+        return self.rehive.admin.transactions.create_credit.call_args[1][
+            'amount']
+
+    def test_bounty_of_same_repository(self):
+        self.create_bounty(
+            'https://api.github.com/repos/other/gitos/issues/5', 300)
+        self.create_bounty('https://github.com/octo/gitos/issues/5', 200)
+
+        self.assertEqual(self.get_credited_amount(), 200)
+
+    def test_newest_bounty(self):
+        self.create_bounty(
+            'https://api.github.com/repos/octo/gitos/issues/5', 200)
+        self.create_bounty('https://github.com/octo/gitos/issues/5', 400)
+
+        self.assertEqual(self.get_credited_amount(), 400)
+
+    def test_without_bounty(self):
+        self.create_bounty(
+            'https://api.github.com/repos/other/gitos/issues/5', 300)
+
+        self.assertEqual(self.get_credited_amount(), 1)
+
+    def test_get_repository(self):
+        self.assertEqual(get_repository(
+            'https://api.github.com/repos/octo/gitos/issues/1'), 'octo/gitos')
+        self.assertIsNone(get_repository('https://github.com/octo'))
+        self.assertIsNone(get_repository(None))
+
+
+class ClaimJobsTests(TestCase):
+
+    def test_due_jobs_are_leased(self):
+        job = GithubWebhookJob.objects.create(payload=PAYLOAD)
+
+        jobs = claim_jobs(10)
+
+        self.assertEqual([j.id for j in jobs], [job.id])
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.next_attempt, timezone.now())
+        self.assertEqual(jobs[0].attempts, 1)
+
+        # A leased job is not handed out again until its lease expires.
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_jobs_not_due_are_skipped(self):
+        GithubWebhookJob.objects.create(payload=PAYLOAD,
+            next_attempt=timezone.now() + timedelta(minutes=5))
+        GithubWebhookJob.objects.create(payload=PAYLOAD,
+            status=WebhookJobStatus.COMPLETE)
+
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_batch_size(self):
+        for i in range(3):
+            GithubWebhookJob.objects.create(payload=PAYLOAD)
+
+        self.assertEqual(len(claim_jobs(2)), 2)
+        self.assertEqual(len(claim_jobs(2)), 1)
+
+
+class ProcessJobsTests(TestCase):
+
+    @mock.patch('gitos.webhooks.process_pull_request')
+    def test_processed_job_is_complete(self, process_pull_request):
+        job = GithubWebhookJob.objects.create(payload=PAYLOAD)
+
+        self.assertEqual(process_jobs(), 1)
+
+        process_pull_request.assert_called_once_with(PAYLOAD)
+        job.refresh_from_db()
+        self.assertEqual(job.status, WebhookJobStatus.COMPLETE)
+        self.assertIsNone(job.error)
+
+    @mock.patch('gitos.webhooks.process_pull_request',
+        side_effect=Exception('Rehive is down'))
+    def test_failed_job_is_retried(self, process_pull_request):
+        job = GithubWebhookJob.objects.create(payload=PAYLOAD)
+
+        process_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, WebhookJobStatus.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.error, 'Rehive is down')
+        self.assertGreater(job.next_attempt, timezone.now())
+
+        # Due again once the backoff has passed.
+        GithubWebhookJob.objects.filter(id=job.id).update(
+            next_attempt=timezone.now())
+        process_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(process_pull_request.call_count, 2)
+
+    @override_settings(GITHUB_WEBHOOK_MAX_ATTEMPTS=1)
+    @mock.patch('gitos.webhooks.process_pull_request',
+        side_effect=Exception('Rehive is down'))
+    def test_job_fails_after_max_attempts(self, process_pull_request):
+        job = GithubWebhookJob.objects.create(payload=PAYLOAD)
+
+        process_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, WebhookJobStatus.FAILED)
+        self.assertEqual(claim_jobs(10), [])
@@ -13,11 +13,13 @@ urlpatterns = (
     # Github
     url(r'^github/$', views.GithubView.as_view(), name='github-pr-view'),
     url(r'^github/bounties/$', views.GithubBountiesListView.as_view(), name='github-bounties-view'),
-    url(r'^github/bounties/(?P<id>.*)/$', views.GithubBountiesView.as_view(), name='github-bounties-view'),
+    url(r'^github/bounties/export/$', views.GithubBountiesExportView.as_view(), name='github-bounties-export'),
+    url(r'^github/bounties/(?P<id>.*)/$', views.GithubBountiesView.as_view(), name='github-bounty-view'),
 
     # Admin
     url(r'^admin/company/$', views.AdminCompanyView.as_view(), name='admin-company'),
     url(r'^admin/currencies/$', views.AdminCurrencyListView.as_view(), name='admin-currencies'),
+    url(r'^admin/currencies/export/$', views.AdminCurrencyExportView.as_view(), name='admin-currencies-export'),
     url(r'^admin/currencies/(?P<code>(\w+))/$', views.AdminCurrencyView.as_view(), name='admin-currencies-view'),
 )
 
@@ -1,32 +1,39 @@
-import os
-import re
-
 from collections import OrderedDict
 from logging import getLogger
-from rehive import Rehive, APIException
 
+from django.conf import settings
 from rest_framework import status, filters, exceptions
-from rest_framework.generics import GenericAPIView
+from rest_framework.generics import GenericAPIView, get_object_or_404
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.decorators import api_view, permission_classes
 
-from gitos.pagination import ResultsSetPagination
+from gitos.cache import cache_response, get_tag_versions
+from gitos.conditional import ConditionalMixin
+from gitos.currencies import (
+    get_company_currencies, get_company_currencies_state
+)
+from gitos.enums import GithubIssueBountyStatus
+from gitos.exports import IgnoreClientContentNegotiation, stream_export
+from gitos.pagination import ResultsSetPagination, CursorResultsSetPagination
 from gitos.authentication import AdminAuthentication, UserAuthentication
 from gitos.serializers import (
     ActivateSerializer, DeactivateSerializer, AdminCompanySerializer,
-    CurrencySerializer, GithubBountiesSerializer, CreateGithubBountiesSerializer
+    CurrencySerializer, GithubBountiesSerializer, CreateGithubBountiesSerializer,
+    CurrencyRowSerializer, GithubBountiesRowSerializer
 )
 from gitos.models import (
-    Currency, User, GithubIssueBounty
+    Currency, GithubIssueBounty
 )
+from gitos.webhooks import enqueue_pull_request
 
 logger = getLogger('django')
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny, ])
+@cache_response('root')
 def root(request, format=None):
     return Response(
         [
@@ -55,11 +62,19 @@ def root(request, format=None):
 class ListModelMixin(object):
     """
     List a queryset.
+
+    Views with a `row_serializer_class` skip model instances and DRF
+    serializers: rows are fetched with `.values_list()` and converted by the
+    row serializer.
     """
+    row_serializer_class = None
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
+        if self.row_serializer_class is not None:
+            return self.list_rows(queryset)
+
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -68,16 +83,46 @@ class ListModelMixin(object):
         serializer = self.get_serializer(queryset, many=True)
         return Response({'status': 'success', 'data': serializer.data})
 
+    def list_rows(self, queryset):
+        serializer = self.row_serializer_class()
+        # Pagination reads the position of a row from its first two columns.
+        rows = queryset.values_list('created', 'id', *serializer.columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            data = [serializer.to_representation(row[2:]) for row in page]
+            return self.get_paginated_response(data)
+
+        data = [serializer.to_representation(row[2:]) for row in rows]
+        return Response({'status': 'success', 'data': data})
+
 
 class ListAPIView(ListModelMixin,
                   GenericAPIView):
     """
     Concrete view for listing a queryset.
+
+    Views that support several pagination styles list them in
+    `pagination_classes`, clients pick one with `?pagination=<style>`.
     """
+    pagination_classes = {}
+    pagination_query_param = 'pagination'
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.get_pagination_class()
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+    def get_pagination_class(self):
+        style = self.request.query_params.get(self.pagination_query_param,
+            settings.DEFAULT_PAGINATION_STYLE)
+        return self.pagination_classes.get(style, self.pagination_class)
+
 
 class ActivateView(GenericAPIView):
     allowed_methods = ('POST',)
@@ -106,21 +151,29 @@ class DeactivateView(GenericAPIView):
         return Response({'status': 'success'})
 
 
-class AdminCompanyView(GenericAPIView):
+class AdminCompanyView(ConditionalMixin, GenericAPIView):
     allowed_methods = ('GET', 'PATCH',)
     serializer_class = AdminCompanySerializer
     authentication_classes = (AdminAuthentication,)
 
+    def get_validator_state(self):
+        return self.request.user.company.updated, ''
+
     def get(self, request, *args, **kwargs):
         company = request.user.company
         serializer = self.get_serializer(company)
         return Response({'status': 'success', 'data': serializer.data})
 
 
-class AdminCurrencyListView(ListAPIView):
+class AdminCurrencyListView(ConditionalMixin, ListAPIView):
     allowed_methods = ('GET',)
     pagination_class = ResultsSetPagination
+    pagination_classes = {
+        'page': ResultsSetPagination,
+        'cursor': CursorResultsSetPagination,
+    }
     serializer_class = CurrencySerializer
+    row_serializer_class = CurrencyRowSerializer
     authentication_classes = (AdminAuthentication,)
     filter_backends = (filters.DjangoFilterBackend,)
     filter_fields = ('code',)
@@ -129,23 +182,58 @@ class AdminCurrencyListView(ListAPIView):
         company = self.request.user.company
         return Currency.objects.filter(company=company)
 
+    def get_validator_state(self):
+        # The cached currencies mirror the table, so they also validate
+        # cursor pages.
+        return get_company_currencies_state(self.request.user.company)
+
+    def list(self, request, *args, **kwargs):
+        # Cursor pages are read from the database, page numbers are served
+        # from the cached currencies of the company.
+        if not isinstance(self.paginator, ResultsSetPagination):
+            return super(AdminCurrencyListView, self).list(
+                request, *args, **kwargs)
+
+        currencies = list(
+            get_company_currencies(request.user.company).values())
 
-class AdminCurrencyView(GenericAPIView):
+        code = request.query_params.get('code')
+        if code:
+            currencies = [c for c in currencies if c['code'] == code]
+
+        page = self.paginate_queryset(currencies)
+        return self.get_paginated_response(page)
+
+
+class AdminCurrencyExportView(GenericAPIView):
     allowed_methods = ('GET',)
-    serializer_class = CurrencySerializer
     authentication_classes = (AdminAuthentication,)
+    content_negotiation_class = IgnoreClientContentNegotiation
 
     def get(self, request, *args, **kwargs):
         company = request.user.company
-        code = kwargs['code']
+        return stream_export(request,
+            Currency.objects.filter(company=company),
+            CurrencyRowSerializer(), 'currencies')
+
+
+class AdminCurrencyView(ConditionalMixin, GenericAPIView):
+    allowed_methods = ('GET',)
+    serializer_class = CurrencySerializer
+    authentication_classes = (AdminAuthentication,)
+
+    def get_validator_state(self):
+        return get_company_currencies_state(self.request.user.company)
+
+    def get(self, request, *args, **kwargs):
+        currencies = get_company_currencies(request.user.company)
 
         try:
-            currency = Currency.objects.get(company=company, code__iexact=code)
-        except Currency.DoesNotExist:
+            currency = currencies[kwargs['code'].upper()]
+        except KeyError:
             raise exceptions.NotFound()
 
-        serializer = self.get_serializer(currency)
-        return Response({'status': 'success', 'data': serializer.data})
+        return Response({'status': 'success', 'data': currency})
 
 
 class GithubView(GenericAPIView):
@@ -160,75 +248,57 @@ class GithubView(GenericAPIView):
                 status=status.HTTP_200_OK
             )
 
-        rehive = Rehive(os.environ.get('REHIVE_AUTH_TOKEN'))
-
-        pull_request = request.data.get('pull_request')
-        pr_id = pull_request.get('id')
-        merged = pull_request.get('merged')
-        user = pull_request.get('user')
-        issue_url = pull_request.get('issue_url')
-        body = pull_request.get('body')
-        action = request.data.get('action')
-        username = user.get('login')
-
-        try:
-            _user = User.objects.get(username=username)
-            try:
-                user = rehive.admin.users.get(str(_user.identifier))
-            except APIException:
-                user = rehive.admin.users.create()
-        except User.DoesNotExist:
-            user = rehive.admin.users.create()
-            User.objects.create(
-                identifier=user.get('identifier'),
-                username=username
-            )
-
-        r = re.search(r'\#([\d]+)', body)
-
-        if r:
-            try:
-                amount = GithubIssueBounty.objects.get(issue_nr=r.group(1)).amount
-            except GithubIssueBounty.DoesNotExist:
-                amount = 1
-
-        if action == 'opened':
-            tx = rehive.admin.transactions.create_credit(
-                user=user.get('identifier'), amount=amount, currency='GITOS', status='pending', reference=str(pr_id)
-            ).get('id')
-        elif action == 'closed':
-            _tx = rehive.admin.transactions.get(
-                filter={'reference': str(pr_id)}
-            )[0]
-            if merged:
-                tx = rehive.admin.transactions.confirm(_tx.get('id'))
-            else:
-                tx = rehive.admin.transactions.fail(_tx.get('id'))
-
-            GithubIssueBounty.close(issue_url)
+        # Rehive calls are made by the webhook worker, outside of the request.
+        delivery, created = enqueue_pull_request(request.data,
+            request.META.get('HTTP_X_GITHUB_DELIVERY'))
 
         return Response(
-            {'status': 'success', 'data': tx},
-            status=status.HTTP_201_CREATED
+            {'status': 'success', 'data': delivery.result if delivery else None},
+            status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK
         )
 
 
-class GithubBountiesListView(GenericAPIView):
+class GithubBountiesListView(ConditionalMixin, ListAPIView):
     allowed_methods = ('POST', 'GET')
     permission_classes = (AllowAny, )
+    pagination_class = CursorResultsSetPagination
     serializer_class = GithubBountiesSerializer
+    row_serializer_class = GithubBountiesRowSerializer
 
     def get_serializer_class(self):
         if self.request.method in ('POST'):
             return CreateGithubBountiesSerializer
         return GithubBountiesSerializer
 
+    def get_validator_state(self):
+        # Bounties are deleted when closed, so the list is validated by the
+        # version of its cache tag and has no `Last-Modified`.
+        return None, get_tag_versions(('bounties',), self.request)[0]
+
+    @cache_response('bounties', tags=('bounties',))
     def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(
-            GithubIssueBounty.objects.all(),
-            many=True
-        )
-        return Response({'status': 'success', 'data': serializer.data})
+        return self.list(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = GithubIssueBounty.objects.all()
+        params = self.request.query_params
+
+        if params.get('status'):
+            try:
+                queryset = queryset.filter(
+                    status=GithubIssueBountyStatus(params['status']))
+            except ValueError:
+                raise exceptions.ValidationError(
+                    {'status': ['Invalid status.']})
+
+        if params.get('issue_nr'):
+            try:
+                queryset = queryset.filter(issue_nr=int(params['issue_nr']))
+            except ValueError:
+                raise exceptions.ValidationError(
+                    {'issue_nr': ['A valid integer is required.']})
+
+        return queryset
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -240,14 +310,31 @@ class GithubBountiesListView(GenericAPIView):
         )
 
 
-class GithubBountiesView(GenericAPIView):
+class GithubBountiesExportView(GenericAPIView):
     allowed_methods = ('GET',)
+    permission_classes = (AllowAny, )
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, *args, **kwargs):
+        return stream_export(request, GithubIssueBounty.objects.all(),
+            GithubBountiesRowSerializer(), 'bounties')
+
+
+class GithubBountiesView(ConditionalMixin, GenericAPIView):
+    allowed_methods = ('GET',)
+    permission_classes = (AllowAny,)
     serializer_class = GithubBountiesSerializer
-    authentication_classes = (AllowAny,)
 
+    def get_queryset(self):
+        try:
+            return GithubIssueBounty.objects.filter(pk=int(self.kwargs['id']))
+        except ValueError:
+            raise exceptions.NotFound()
+
+    @cache_response('bounty', tags=('bounties',))
     def get(self, request, *args, **kwargs):
         serializer = self.get_serializer(
-            GithubIssueBounty.objects.get(pk=kwargs.get('id'))
+            get_object_or_404(self.get_queryset())
         )
         return Response({'status': 'success', 'data': serializer.data})
 
@@ -0,0 +1,276 @@
+import os
+import random
+import re
+
+from datetime import timedelta
+from logging import getLogger
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rehive import APIException
+
+from gitos.clients import get_rehive
+from gitos.enums import GithubIssueBountyStatus, WebhookJobStatus
+from gitos.models import (
+    User, GithubIssueBounty, GithubWebhookJob, GithubDelivery,
+    PullRequestTransaction
+)
+
+logger = getLogger('django')
+
+
+PULL_REQUEST_ACTIONS = ('opened', 'closed',)
+
+
+def enqueue_pull_request(data, delivery_id=None):
+    """
+    Store a compact copy of a GitHub pull request event for the webhook
+    worker.
+
+    Redeliveries are matched on the GitHub delivery id and are not queued
+    again. Without a delivery id, an event for the same (pr_id, action) pair
+    is only taken for a redelivery within `GITHUB_DELIVERY_DEDUPE_WINDOW`
+    seconds, so that a pull request closed again after being reopened is
+    still processed. Returns a `(delivery, created)` tuple, or
+    `(None, False)` for events that do not need processing.
+    """
+    pull_request = data.get('pull_request')
+    action = data.get('action')
+
+    if not pull_request or action not in PULL_REQUEST_ACTIONS:
+        return None, False
+
+    pr_id = pull_request.get('id')
+
+    if not delivery_id:
+        since = timezone.now() - timedelta(
+            seconds=settings.GITHUB_DELIVERY_DEDUPE_WINDOW)
+        delivery = GithubDelivery.objects.filter(pr_id=pr_id, action=action,
+            created__gte=since).order_by('-created').first()
+        if delivery is not None:
+            return delivery, False
+
+    try:
+        with transaction.atomic():
+            delivery = GithubDelivery.objects.create(
+                delivery_id=delivery_id or None, pr_id=pr_id, action=action)
+            job = GithubWebhookJob.objects.create(payload={
+                'pr_id': pr_id,
+                'action': action,
+                'merged': pull_request.get('merged'),
+                'username': (pull_request.get('user') or {}).get('login'),
+                'issue_url': pull_request.get('issue_url'),
+                'body': pull_request.get('body') or '',
+            })
+            delivery.result = {'job': job.id}
+            delivery.save()
+    except IntegrityError:
+        # Only the delivery id is unique.
+        delivery = GithubDelivery.objects.filter(
+            delivery_id=delivery_id).first()
+        return delivery, False
+
+    return delivery, True
+
+
+def prune_deliveries(days):
+    """
+    Delete delivery records older than `days` in a single statement.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, rows = GithubDelivery.objects.filter(created__lt=cutoff).delete()
+    return deleted
+
+
+def get_repository(issue_url):
+    """
+    Return the `owner/name` of the repository of a GitHub issue url, or `None`.
+    """
+    r = re.search(r'/([^/]+/[^/]+)/issues/\d+/?$', issue_url or '')
+    return r.group(1) if r else None
+
+
+def get_open_bounty_amount(issue_nr, issue_url):
+    """
+    Return the amount of the open bounty on issue `issue_nr` of the repository
+    of the pull request at `issue_url`, or `None`.
+
+    Issue numbers repeat across repositories, so bounties are matched on the
+    end of their url (API or web) and the newest one is used.
+    """
+    # Served by the partial index on open bounties.
+    bounties = GithubIssueBounty.objects.filter(
+        issue_nr=issue_nr, status=GithubIssueBountyStatus.OPEN)
+
+    repository = get_repository(issue_url)
+    if repository is not None:
+        bounties = bounties.filter(
+            url__endswith='/{}/issues/{}'.format(repository, issue_nr))
+
+    return bounties.order_by('-created', '-id').values_list(
+        'amount', flat=True).first()
+
+
+def process_pull_request(payload):
+    """
+    Credit (on open) or settle (on close) the Rehive transaction for a pull
+    request.
+    """
+    rehive = get_rehive(os.environ.get('REHIVE_AUTH_TOKEN'))
+
+    pr_id = payload['pr_id']
+    action = payload['action']
+
+    if action == 'opened':
+        username = payload['username']
+
+        try:
+            _user = User.objects.get(username=username)
+            try:
+                user = rehive.admin.users.get(str(_user.identifier))
+            except APIException:
+                user = rehive.admin.users.create()
+        except User.DoesNotExist:
+            user = rehive.admin.users.create()
+            User.objects.create(
+                identifier=user.get('identifier'),
+                username=username
+            )
+
+        amount = 1
+        r = re.search(r'\#([\d]+)', payload['body'])
+
+        if r:
+            bounty = get_open_bounty_amount(r.group(1), payload['issue_url'])
+            if bounty is not None:
+                amount = bounty
+
+        # The idempotency key stops Rehive from crediting a retried job twice.
+        tx = rehive.admin.transactions.create_credit(
+            user=user.get('identifier'), amount=amount, currency='GITOS', status='pending', reference=str(pr_id),
+            idempotent_key='gitos-pr-{}-credit'.format(pr_id)
+        ).get('id')
+
+        PullRequestTransaction.objects.update_or_create(pr_id=pr_id,
+            defaults={'tx_id': tx})
+        return tx
+
+    elif action == 'closed':
+        tx_id = PullRequestTransaction.objects.filter(
+            pr_id=pr_id).values_list('tx_id', flat=True).first()
+
+        # Only search Rehive for transactions credited before the mapping
+        # existed.
+        if tx_id is None:
+            tx_id = rehive.admin.transactions.get(
+                filters={'reference': str(pr_id)}
+            )[0].get('id')
+
+        if payload['merged']:
+            tx = rehive.admin.transactions.confirm(tx_id)
+        else:
+            tx = rehive.admin.transactions.fail(tx_id)
+
+        GithubIssueBounty.close(payload['issue_url'])
+        return tx
+
+
+def backfill_pull_request_transactions(rehive, batch_size=500):
+    """
+    Page through the GITOS credits on Rehive and store the transaction of
+    every pull request that is missing locally. Returns the number of
+    mappings created.
+    """
+    resource = rehive.admin.transactions
+    seen = set(PullRequestTransaction.objects.values_list('pr_id', flat=True))
+    created = 0
+
+    txs = resource.get(filters={'currency': 'GITOS', 'tx_type': 'credit'})
+    while True:
+        batch = []
+        for tx in txs:
+            reference = tx.get('reference') or ''
+            if not reference.isdigit() or int(reference) in seen:
+                continue
+            seen.add(int(reference))
+            batch.append(PullRequestTransaction(
+                pr_id=int(reference), tx_id=tx.get('id')))
+
+        for i in range(0, len(batch), batch_size):
+            PullRequestTransaction.objects.bulk_create(
+                batch[i:i + batch_size])
+        created += len(batch)
+
+        if not resource.next:
+            break
+        txs = resource.get_next()
+
+    return created
+
+
+def get_retry_delay(attempts):
+    """
+    Exponential backoff with jitter for a job that has failed `attempts` times.
+    """
+    delay = min(settings.GITHUB_WEBHOOK_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.GITHUB_WEBHOOK_MAX_RETRY_DELAY)
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+
+def claim_jobs(batch_size):
+    """
+    Lease a batch of due jobs in a short transaction. Rows locked by other
+    workers are skipped so that several workers can drain the queue
+    concurrently, and leased jobs are not due again until the lease expires.
+    """
+    with transaction.atomic():
+        jobs = list(GithubWebhookJob.objects.raw(
+            'SELECT * FROM {table} '
+            'WHERE status = %s AND next_attempt <= %s '
+            'ORDER BY next_attempt '
+            'LIMIT %s '
+            'FOR UPDATE SKIP LOCKED'.format(
+                table=GithubWebhookJob._meta.db_table),
+            [WebhookJobStatus.PENDING.value, timezone.now(), batch_size]
+        ))
+
+        lease = timezone.now() + timedelta(
+            seconds=settings.GITHUB_WEBHOOK_LEASE)
+        GithubWebhookJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            attempts=F('attempts') + 1, next_attempt=lease)
+
+    for job in jobs:
+        job.attempts += 1
+        job.next_attempt = lease
+
+    return jobs
+
+
+def process_jobs(batch_size=10):
+    """
+    Process one batch of queued jobs and return the number of jobs handled.
+    Each job is processed and marked complete in its own transaction.
+    """
+    jobs = claim_jobs(batch_size)
+
+    for job in jobs:
+        try:
+            with transaction.atomic():
+                process_pull_request(job.payload)
+                job.status = WebhookJobStatus.COMPLETE
+                job.error = None
+                job.save()
+        except Exception as exc:
+            logger.exception(exc)
+            job.error = str(exc)
+            if job.attempts >= settings.GITHUB_WEBHOOK_MAX_ATTEMPTS:
+                job.status = WebhookJobStatus.FAILED
+            else:
+                job.status = WebhookJobStatus.PENDING
+                job.next_attempt = timezone.now() + get_retry_delay(
+                    job.attempts)
+            job.save()
+
+    return len(jobs)